@@ -8,10 +8,25 @@ This module contains:
 """
 
 import hashlib
+import functools
 import os
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DEFAULT_SALT = 'gradescope_anonmization'
+MAX_REHASH_ATTEMPTS = 100
+
+# Bind the hash constructor once; usedforsecurity=False (Python 3.9+) lets
+# OpenSSL use its fastest SHA-256 path since the digest is only an identifier
+try:
+    hashlib.sha256(b'', usedforsecurity=False)
+    _sha256 = functools.partial(hashlib.sha256, usedforsecurity=False)
+except TypeError:
+    _sha256 = hashlib.sha256
 
 
 def generate_anonymous_id(name_student_id, salt = DEFAULT_SALT):
@@ -26,12 +41,24 @@ def generate_anonymous_id(name_student_id, salt = DEFAULT_SALT):
         str: An 8-character anonymous ID derived from the hashed student ID
              This ID will be consistent for the same name_student_id and salt
     """
-    # Create the hash value with using student ID and a salt value
-    hash_obj = hashlib.sha256((name_student_id + salt).encode())
-    hashed = hash_obj.hexdigest()
+    # Create the hash value with using student ID and a salt value,
+    # then use the first 4 bytes (8 hex characters) as the anonymous ID
+    return _sha256((name_student_id + salt).encode()).digest()[:4].hex()
+
+
+def _batch_digests(name_student_ids, salt_bytes):
+    """
+    Hashes a batch of student IDs in one pass.
 
-    # Use the first 8 bits of the hash as an anonymous ID
-    return hashed[:8]
+    Parameters:
+        name_student_ids: List of student IDs to hash
+        salt_bytes (bytes): Encoded salt appended to every student ID
+
+    Returns:
+        list: The first 4 bytes of each SHA-256 digest, in input order
+    """
+    hashes = map(_sha256, [name_student_id.encode() + salt_bytes for name_student_id in name_student_ids])
+    return [hash_obj.digest()[:4] for hash_obj in hashes]
 
 
 def create_anonymization_mapping(name_student_ids, id_to_anonymous = dict(), salt = DEFAULT_SALT):
@@ -49,15 +76,29 @@ def create_anonymization_mapping(name_student_ids, id_to_anonymous = dict(), sal
     Returns:
         dict: Mapping from student IDs to anonymous IDs
     """
-    # Create mapping tables
-    duplicate_anonymous_ids = set()
+    # Anonymous IDs that are already taken
+    assigned_anonymous_ids = set(id_to_anonymous.values())
+
+    # Encode the salt once instead of once per student
+    salt_bytes = salt.encode()
+
+    # Only hash the students that are not mapped yet, all in one batch
+    new_name_student_ids = [name_student_id for name_student_id in dict.fromkeys(name_student_ids)
+                            if name_student_id not in id_to_anonymous]
+    digests = _batch_digests(new_name_student_ids, salt_bytes)
 
     # Create an anonymous ID for each student ID
-    for name_student_id in name_student_ids:
-        if name_student_id in id_to_anonymous:
-            continue
-        anonymous_id = generate_anonymous_id(name_student_id, salt)
-        duplicate_anonymous_ids.add(anonymous_id)
+    for name_student_id, digest in zip(new_name_student_ids, digests):
+        anonymous_id = digest.hex()
+
+        # On collision, add a counter to the student ID and rehash
+        attempt = 0
+        while anonymous_id in assigned_anonymous_ids:
+            attempt += 1
+            if attempt > MAX_REHASH_ATTEMPTS:
+                raise ValueError(f"Could not generate a unique anonymous ID for {name_student_id}")
+            anonymous_id = _sha256(f"{name_student_id}:{attempt}".encode() + salt_bytes).digest()[:4].hex()
+        assigned_anonymous_ids.add(anonymous_id)
 
         # save the mapping data
         id_to_anonymous[name_student_id] = anonymous_id
@@ -69,8 +110,9 @@ def save_mapping_table(id_to_anonymous, saved_path = 'mapping_table.json'):
     """
     Saves the student ID to anonymous ID mapping table to a file.
     
-    This function takes the mapping dictionary, creates a bidirectional 
-    mapping structure, and save it.
+    Only the student ID to anonymous ID direction is saved; the reverse 
+    mapping is rebuilt by load_mapping_table. Uses orjson when it is 
+    installed and falls back to the standard json module otherwise.
     
     Parameters:
         mapping: Dictionary mapping student IDs to anonymous IDs
@@ -80,19 +122,19 @@ def save_mapping_table(id_to_anonymous, saved_path = 'mapping_table.json'):
     Returns:
        Bool: Whether the saving is successful or not.
     """
-    # Create reverse mapping
-    anonymous_to_id = {anonymous_id: name_student_id for name_student_id, anonymous_id in id_to_anonymous.items()}
-
     # Data structures to be preserved
     mapping_data = {
         "salt": DEFAULT_SALT,
-        "id_to_anonymous": id_to_anonymous,
-        "anonymous_to_id": anonymous_to_id
+        "id_to_anonymous": id_to_anonymous
     }
 
-    # Save to file
-    with open(saved_path, 'w', encoding='utf-8') as f:
-        json.dump(mapping_data, f, indent=2)
+    # Save to file as compact JSON, indentation would make up most of the file
+    if orjson is not None:
+        with open(saved_path, 'wb') as f:
+            f.write(orjson.dumps(mapping_data))
+    else:
+        with open(saved_path, 'w', encoding='utf-8') as f:
+            json.dump(mapping_data, f, separators=(',', ':'))
 
     #print(f"Encrypted mapping table have saved to {saved_path}")
     return True
@@ -111,12 +153,20 @@ def load_mapping_table(saved_path = 'mapping_table.json'):
             - dict: Mapping from anonymous IDs to student IDs
     """
     # Read the encrypted file
-    with open(saved_path, 'r', encoding='utf-8') as f:
-        mapping_data = json.load(f)
+    if orjson is not None:
+        with open(saved_path, 'rb') as f:
+            mapping_data = orjson.loads(f.read())
+    else:
+        with open(saved_path, 'r', encoding='utf-8') as f:
+            mapping_data = json.load(f)
     
     # Extract the mapping tables and salt
     id_to_anonymous = mapping_data.get("id_to_anonymous", {})
-    anonymous_to_id = mapping_data.get("anonymous_to_id", {})
+
+    # Older mapping tables also saved the reverse mapping
+    anonymous_to_id = mapping_data.get("anonymous_to_id")
+    if anonymous_to_id is None:
+        anonymous_to_id = {anonymous_id: name_student_id for name_student_id, anonymous_id in id_to_anonymous.items()}
     
     return id_to_anonymous, anonymous_to_id
 
@@ -11,44 +11,90 @@ import csv
 import os
 import random
 
+ANONYMIZED_ROSTER_HEADER = ['First Name', 'Last Name', 'SID', 'Email', 'Role']
 
-def read_roster_file(file_path, name_student_ids = list(), roles = dict()):
+# Same line ending as csv.writer uses by default
+CSV_LINE_TERMINATOR = '\r\n'
+
+
+def _get_field(row, index):
+    """ 
+    Return the stripped value at index of a CSV row, or '' if the column is missing 
+    """
+    if index is None or index >= len(row):
+        return ''
+    return row[index].strip()
+
+
+def _escape_field(value):
+    """ 
+    Quote a CSV field only if it contains a delimiter, quote or line break 
+    """
+    if any(char in value for char in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def read_roster_file(file_path, name_student_ids = None, roles = None):
     """ 
     Read roster CSV file to extract student IDs and roles 
     
     Parameters: 
         file_path (str): path to roster file 
+        name_student_ids (list): student IDs read so far, new students are appended to it 
+        roles (dict): roles read so far, new students are added to it 
         
     Returns: 
         tuple: tuple containing: 
         - list: list of student IDs 
         - dict: mapping of student IDs to roles 
     """
+    if name_student_ids is None:
+        name_student_ids = list()
+    if roles is None:
+        roles = dict()
+
+    # set of the student IDs already collected, for constant time duplicate checks
+    seen = set(name_student_ids)
+
     check_diff = list()
     with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+
+        # Look up the column positions once from the header
+        header = next(reader, [])
+        columns = {name: index for index, name in enumerate(header)}
+        i_first_name = columns.get('First Name')
+        i_last_name = columns.get('Last Name')
+        i_full_name = columns.get('Name')
+        i_student_id = columns.get('SID')
+        i_role = columns.get('Role')
 
         for row in reader:
-            first_name = row.get('First Name', '').strip()
-            last_name = row.get('Last Name', '').strip()
-            full_name = row.get('Name', '').strip()
-            student_id = row.get('SID', '').strip()
-            role = row.get('Role', '').strip()
+            first_name = _get_field(row, i_first_name)
+            last_name = _get_field(row, i_last_name)
+            full_name = _get_field(row, i_full_name)
+            student_id = _get_field(row, i_student_id)
+            role = _get_field(row, i_role)
 
             if not student_id:
                 continue
             
             if full_name:
-                first_name, last_name = full_name.split()
+                # keep middle names with the last name, single names keep the Last Name column
+                name_parts = full_name.split()
+                first_name = name_parts[0]
+                last_name = " ".join(name_parts[1:]) or last_name
 
             name_student_id = f"{first_name}_{last_name}_{student_id}"
 
             diff = f"{last_name}_{student_id}"
 
-            if name_student_id in name_student_ids:
+            if name_student_id in seen:
                 #print(f'detected {name_student_id}, pass this student.')
                 continue
             #print(name_student_id)
+            seen.add(name_student_id)
             name_student_ids.append(name_student_id)
             roles[name_student_id] = role
             check_diff.append(diff)
@@ -74,29 +120,19 @@ def create_anonymized_roster(mapping, roles, saved_path):
     if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    mapping_items = list(mapping.items())
-    random.shuffle(mapping_items)
-
+    # Anonymous IDs are hex and names are generated, only the role can need escaping
     rows = []
-    for name_student_id, anonymous_id in mapping_items:
+    for name_student_id, anonymous_id in mapping.items():
         # get a stable number name
         name = int(anonymous_id, 16) % 1000
-        rows.append({
-            'First Name': f"st{name}",
-            'Last Name': anonymous_id,
-            'SID': anonymous_id,
-            'Email': f"{anonymous_id}@example.edu",
-            'Role': roles[name_student_id]
-        })
+        rows.append(f"st{name},{anonymous_id},{anonymous_id},{anonymous_id}@example.edu,"
+                    f"{_escape_field(roles[name_student_id])}{CSV_LINE_TERMINATOR}")
+    # shuffle once so the roster order does not follow the original one
     random.shuffle(rows)
 
-    # write anonymized roster file
-    with open(saved_path, 'w', newline='', encoding='utf-8') as f:
-        fieldnames = ['First Name', 'Last Name', 'SID', 'Email', 'Role']
-        writer = csv.DictWriter(f, fieldnames = fieldnames)
-        writer.writeheader()
-        
-        for row in rows:
-            writer.writerow(row)
+    # write anonymized roster file in one go
+    header = ",".join(ANONYMIZED_ROSTER_HEADER) + CSV_LINE_TERMINATOR
+    with open(saved_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(header + "".join(rows))
     
     print(f"Anonymized rosters have been saved to {saved_path}.")
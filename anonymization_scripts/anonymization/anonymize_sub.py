@@ -10,27 +10,70 @@ This module contains:
 import os
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 
+# Upper bound on concurrent file copies, copying is disk bound
+COPY_MAX_WORKERS = 8
 
-def find_submission_files(submission_dir, pattern=r'.*\.zip'):
+
+def _iter_matching_files(directory, matcher):
+    """
+    Recursively yields paths of files under directory whose name satisfies matcher 
+    """
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _iter_matching_files(entry.path, matcher)
+                elif matcher(entry.name):
+                    yield entry.path
+    except OSError:
+        # Unreadable or missing directories are skipped, like os.walk does
+        return
+
+
+def find_submission_files(submission_dir, pattern=None, exts=('.zip',)):
     """
     Finds files in submission directory that match pattern 
     
     Parameters: 
     submission_dir (str): submission directory 
-    pattern (str): regular expression for filename pattern 
+    pattern (str or re.Pattern): optional regular expression for filename pattern, 
+        a compiled pattern is used as it is 
+    exts (tuple): filename extensions to match when no pattern is given 
         
      Returns: 
     list: list of paths to files found 
     """
-    matching_files = []
+    # Compile the pattern once, otherwise just compare the filename suffix
+    if isinstance(pattern, re.Pattern):
+        matcher = pattern.match
+    elif pattern is not None:
+        matcher = re.compile(pattern, re.IGNORECASE).match
+    else:
+        matcher = lambda filename: filename.lower().endswith(exts)
     
-    for root, _, files in os.walk(submission_dir):
-        for filename in files:
-            if re.match(pattern, filename, re.IGNORECASE):
-                matching_files.append(os.path.join(root, filename))
+    return list(_iter_matching_files(submission_dir, matcher))
+
+
+def build_prefix_index(name_student_ids):
+    """
+    Builds a lookup index from lowercase firstname_lastname to complete student identifiers 
     
-    return matching_files
+    Parameters: 
+        name_student_ids: all student ids (firstname_lastname_studentid)
+        
+    Returns: 
+        dict: lowercase firstname_lastname -> list of matching student ids, in input order 
+    """
+    prefix_index = {}
+    for full_id in name_student_ids:
+        parts = full_id.split("_", 2)
+        if len(parts) < 3:
+            continue
+        key = f"{parts[0]}_{parts[1]}".lower()
+        prefix_index.setdefault(key, []).append(full_id)
+    return prefix_index
 
 
 def extract_student_identifier(filename, name_student_ids):
@@ -39,11 +82,14 @@ def extract_student_identifier(filename, name_student_ids):
     
     Parameters: 
         filename (str): filename 
-        name_student_ids: all student ids
+        name_student_ids: all student ids, or an index built by build_prefix_index 
         
     Returns: 
         str: name_student_ids extracted, returns None if not found 
     """
+    if not isinstance(name_student_ids, dict):
+        name_student_ids = build_prefix_index(name_student_ids)
+
     # Trying to extract firstname_lastname_number format
     base_name = os.path.splitext(os.path.basename(filename))[0]
     
@@ -51,13 +97,12 @@ def extract_student_identifier(filename, name_student_ids):
     parts = base_name.split('_')
     if len(parts) >= 2:
         # Take the first two parts as the name
-        name_part = f"{parts[0]}_{parts[1]}"
+        name_part = f"{parts[0]}_{parts[1]}".lower()
         
-        # Find matching name_student_ids in student_ids
-        for full_id in name_student_ids:
-            # Check if it starts with name_part
-            if full_id.lower().startswith(name_part.lower() + "_"):
-                return full_id
+        # If several students share a name, the first one in the roster wins
+        matches = name_student_ids.get(name_part)
+        if matches:
+            return matches[0]
     
     return None
 
@@ -88,6 +133,12 @@ def anonymize_submission_files(submission_dir, output_dir, mapping, student_ids)
     
     processed_count = 0
     anonymized_count = 0
+
+    # Index the student ids once instead of scanning them for every file
+    prefix_index = build_prefix_index(student_ids)
+
+    # Destination path -> source path, so a student with several files is only written once
+    copy_jobs = {}
     
     print('')
 
@@ -97,7 +148,7 @@ def anonymize_submission_files(submission_dir, output_dir, mapping, student_ids)
         file_name = os.path.basename(file_path)
         
         # Match complete student identifier (firstname_lastname_studentid) from filename (firstname_lastname.zip)
-        full_student_id = extract_student_identifier(file_name, student_ids)
+        full_student_id = extract_student_identifier(file_name, prefix_index)
         
         if full_student_id and full_student_id in mapping:
             # Create new filename using anonymous ID
@@ -106,16 +157,21 @@ def anonymize_submission_files(submission_dir, output_dir, mapping, student_ids)
             new_file_name = f"{anonymous_id}{file_ext}"
             new_file_path = os.path.join(output_dir, new_file_name)
             
-            # Copy and rename file
-            shutil.copy2(file_path, new_file_path)
+            # Queue the copy, files are copied together below
+            copy_jobs[new_file_path] = file_path
             anonymized_count += 1
-            print(f"Anonymized: {new_file_name}")
             
         else:
             # Unable to match student identifier
             base_name = os.path.splitext(os.path.basename(file_name))[0]
             print(f"Warning: Could not match '{base_name}' to any complete student identifier")
+
+    # Copy and rename files in parallel, metadata of the original files is not needed
+    if copy_jobs:
+        with ThreadPoolExecutor(max_workers=min(COPY_MAX_WORKERS, len(copy_jobs))) as executor:
+            list(executor.map(shutil.copyfile, copy_jobs.values(), copy_jobs.keys()))
     
+    print(f"Anonymized {anonymized_count} of {processed_count} files")
     print(f"Anonymized submission files saved to: {output_dir}")
     return processed_count, anonymized_count
 
@@ -1,8 +1,23 @@
-from bs4 import BeautifulSoup
 import os
 import re
 import csv
-import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+# Parse the submissions page with lxml directly when it is installed
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# Number of submissions downloaded at the same time
+DOWNLOAD_MAX_WORKERS = 8
+
+# Buffer size used when streaming a download to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+_SUBMISSION_ID_RE = re.compile(r'/submissions/(\d+)')
+_UNSAFE_NAME_CHARS_RE = re.compile(r'[^a-zA-Z0-9_.-]')
 
 
 def setup_directories(base_dirs):
@@ -42,23 +57,70 @@ def get_submissions(session, course_id, assignment_id):
     """
     assignment_url = f'https://www.gradescope.com/courses/{course_id}/assignments/{assignment_id}/submissions'
     resp = session.get(assignment_url)
-    soup = BeautifulSoup(resp.text, 'html.parser')
+
+    # Collect (name, href) of the first link in every table row
+    links = []
+    if lxml is not None:
+        # lxml refuses to parse an empty document
+        rows = lxml.html.fromstring(resp.text).iter('tr') if resp.text.strip() else ()
+        for row in rows:
+            a_tag = next(row.iterfind('.//a[@href]'), None)
+            if a_tag is not None:
+                links.append((a_tag.text_content(), a_tag.get('href')))
+    else:
+        # bs4 is only needed without lxml, import it here to keep startup light
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(resp.text, 'html.parser')
+        for row in soup.find_all('tr'):
+            a_tag = row.find('a', href=True)
+            if a_tag:
+                links.append((a_tag.text, a_tag['href']))
 
     submissions = []
-    for row in soup.find_all('tr'):
-        a_tag = row.find('a', href=True)
-        if a_tag and '/submissions/' in a_tag['href']:
-            name = a_tag.text.strip()
-            match = re.search(r'/submissions/(\d+)', a_tag['href'])
+    for name, href in links:
+        if '/submissions/' in href:
+            match = _SUBMISSION_ID_RE.search(href)
             if match:
                 submission_id = match.group(1)
-                submissions.append((name, submission_id))
+                submissions.append((name.strip(), submission_id))
 
     print(f"🎯 Found {len(submissions)} submissions, starting batch download...")
     return submissions
 
 
-def download_zip_files(session, course_id, assignment_id, submissions, zip_dir, csv_path):
+def _download_file(session, url, file_path, magic):
+    """
+    Download a single file, keeping it only if its content starts with the expected bytes
+    
+    Args:
+        session: Logged-in session object
+        url (str): File URL
+        file_path (str): Path to save the file
+        magic (bytes): Expected leading bytes of the file content
+        
+    Returns:
+        bool: Whether the file was downloaded and saved
+    """
+    # Stream the body to disk instead of holding the whole file in memory
+    response = session.get(url, stream=True)
+    try:
+        if response.status_code != 200:
+            return False
+
+        response.raw.decode_content = True
+        head = response.raw.read(len(magic))
+        if not head.startswith(magic):
+            return False
+
+        with open(file_path, 'wb') as f:
+            f.write(head)
+            shutil.copyfileobj(response.raw, f, DOWNLOAD_CHUNK_SIZE)
+        return True
+    finally:
+        response.close()
+
+
+def download_zip_files(session, course_id, assignment_id, submissions, zip_dir, csv_path, max_workers = DOWNLOAD_MAX_WORKERS):
     """
     Download all student ZIP submissions
     
@@ -69,37 +131,38 @@ def download_zip_files(session, course_id, assignment_id, submissions, zip_dir,
         submissions (list): List of (student_name, submission_id) tuples
         zip_dir (str): Directory path to save ZIP files
         csv_path (str): File path to save CSV index
+        max_workers (int): Number of files downloaded at the same time
     """
     print("\n📦 Downloading original submission files (ZIP)...")
+
+    def fetch(job):
+        count, (student_name, submission_id) = job
+        safe_name = _UNSAFE_NAME_CHARS_RE.sub('_', student_name)
+        filename = f"{safe_name}_{submission_id}.zip"
+        file_path = os.path.join(zip_dir, filename)
+
+        # Overwrite existing files
+        print(f"✅ Downloading: No.{count}")
+
+        zip_url = f"https://www.gradescope.com/courses/{course_id}/assignments/{assignment_id}/submissions/{submission_id}.zip"
+        if _download_file(session, zip_url, file_path, b'PK'):
+            return [student_name, submission_id, filename]
+        print(f"⚠️ ZIP download failed for No.{count}, skipping")
+        return None
+
     with open(csv_path, 'w', newline='') as f:
         writer = csv.writer(f)
         writer.writerow(['student_name', 'submission_id', 'filename'])
-        
-        count = 1
-        for student_name, submission_id in submissions:
-            safe_name = re.sub(r'[^a-zA-Z0-9_.-]', '_', student_name)
-            filename = f"{safe_name}_{submission_id}.zip"
-            file_path = os.path.join(zip_dir, filename)
-
-            # Overwrite existing files
-            print(f"✅ Downloading: No.{count}")
-
-            zip_url = f"https://www.gradescope.com/courses/{course_id}/assignments/{assignment_id}/submissions/{submission_id}.zip"
-            response = session.get(zip_url)
-
-            if response.status_code == 200 and response.content.startswith(b'PK'):
-                with open(file_path, 'wb') as zf:
-                    zf.write(response.content)
-                writer.writerow([student_name, submission_id, filename])
-            else:
-                print(f"⚠️ ZIP download failed for No.{count}, skipping")
-
-            time.sleep(1)
-            count += 1
+
+        # Download in parallel, index rows are still written in submission order
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for row in executor.map(fetch, enumerate(submissions, start=1)):
+                if row:
+                    writer.writerow(row)
     #print(f"📂 ZIP files saved in: {zip_dir}")
 
 
-def download_pdf_files(session, course_id, assignment_id, submissions, pdf_dir, csv_path):
+def download_pdf_files(session, course_id, assignment_id, submissions, pdf_dir, csv_path, max_workers = DOWNLOAD_MAX_WORKERS):
     """
     Download all graded PDF files for students
     
@@ -110,30 +173,34 @@ def download_pdf_files(session, course_id, assignment_id, submissions, pdf_dir,
         submissions (list): List of (student_name, submission_id) tuples
         pdf_dir (str): Directory path to save PDF files
         csv_path (str): File path to save CSV index
+        max_workers (int): Number of files downloaded at the same time
     """
     print("\n📄 Downloading Graded Copy PDFs...")
-    with open(csv_path, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['student_name', 'submission_id', 'filename'])
 
-        for student_name, submission_id in submissions:
-            safe_name = re.sub(r'[^a-zA-Z0-9_.-]', '_', student_name)
-            filename = f"{safe_name}_{submission_id}.pdf"
-            file_path = os.path.join(pdf_dir, filename)
+    def fetch(submission):
+        student_name, submission_id = submission
+        safe_name = _UNSAFE_NAME_CHARS_RE.sub('_', student_name)
+        filename = f"{safe_name}_{submission_id}.pdf"
+        file_path = os.path.join(pdf_dir, filename)
+
+        # Overwrite existing files
+        print(f"✅ Downloading: {filename}")
 
-            # Overwrite existing files
-            print(f"✅ Downloading: {filename}")
+        pdf_url = f"https://www.gradescope.com/courses/{course_id}/assignments/{assignment_id}/submissions/{submission_id}.pdf"
+        if _download_file(session, pdf_url, file_path, b'%PDF'):
+            return [student_name, submission_id, filename]
+        print(f"⚠️ PDF does not exist or not graded for {student_name}, skipping")
+        return None
 
-            pdf_url = f"https://www.gradescope.com/courses/{course_id}/assignments/{assignment_id}/submissions/{submission_id}.pdf"
-            response = session.get(pdf_url)
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['student_name', 'submission_id', 'filename'])
 
-            if response.status_code == 200 and response.content.startswith(b'%PDF'):
-                with open(file_path, 'wb') as pf:
-                    pf.write(response.content)
-                writer.writerow([student_name, submission_id, filename])
-            else:
-                print(f"⚠️ PDF does not exist or not graded for {student_name}, skipping")
-            time.sleep(1)
+        # Download in parallel, index rows are still written in submission order
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for row in executor.map(fetch, submissions):
+                if row:
+                    writer.writerow(row)
     #print(f"📂 PDF files saved in: {pdf_dir}")
 
 
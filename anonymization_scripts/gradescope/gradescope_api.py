@@ -1,9 +1,37 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import random
 import uuid
 import json
 import re
+import html
+
+# Use the much faster lxml parser when it is installed
+try:
+    import lxml
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Connection pool size, large enough for the parallel submission downloads and uploads
+POOL_SIZE = 16
+
+# Transient statuses retried with backoff, POST uploads handle their own retries
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+# Opening tag of the assignments table and the JSON props stored on it
+_ASSIGNMENTS_TABLE_RE = re.compile(r'<div\b[^>]*\bdata-react-class="AssignmentsTable"[^>]*>')
+_REACT_PROPS_RE = re.compile(r'\bdata-react-props="([^"]*)"')
+
+# User-Agent strings to pick from, one is chosen per session
+_USER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Safari/605.1.15',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36'
+)
 
 def anti_cache_headers():
     """
@@ -12,15 +40,8 @@ def anti_cache_headers():
     Returns: 
         dict: Header with random User-Agent and cache-prevention directive
     """
-    user_agents = [
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Safari/605.1.15',
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0',
-        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/90.0.4430.212 Safari/537.36'
-    ]
-    
     return {
-        'User-Agent': random.choice(user_agents),
+        'User-Agent': random.choice(_USER_AGENTS),
         'Cache-Control': 'no-cache, no-store, must-revalidate, max-age=0',
         'Pragma': 'no-cache',
         'Expires': '0',
@@ -48,8 +69,15 @@ def login_to_gradescope(email, password):
     headers = anti_cache_headers()
     session.headers.update(headers)
 
+    # Keep connections alive across parallel requests and retry transient failures
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE,
+                          max_retries=Retry(total=3, backoff_factor=0.5,
+                                            status_forcelist=RETRY_STATUS_CODES,
+                                            raise_on_status=False))
+    session.mount("https://", adapter)
+
     login_page = session.get("https://www.gradescope.com/login")
-    soup = BeautifulSoup(login_page.text, 'html.parser')
+    soup = BeautifulSoup(login_page.text, HTML_PARSER)
 
     csrf_token = soup.find('input', {'name': 'authenticity_token'})['value']
 
@@ -70,21 +98,47 @@ def login_to_gradescope(email, password):
     return session
 
 
+def _find_assignments_props(page_text):
+    """
+    Extracts the raw JSON props of the assignments table from the page.
+    
+    Only the opening tag of the table is matched, so the rest of the 
+    page does not need to be parsed. 
+    
+    Args: 
+        page_text (str): HTML of the course assignments page 
+    
+    Returns: 
+        str: The unescaped data-react-props value, or None if not found
+    """
+    table_tag = _ASSIGNMENTS_TABLE_RE.search(page_text)
+    if not table_tag:
+        return None
+    props = _REACT_PROPS_RE.search(table_tag.group(0))
+    if not props:
+        return None
+    return html.unescape(props.group(1))
+
+
 def get_assignment_id(session, course_id):
     url = f'https://www.gradescope.com/courses/{course_id}/assignments'
     response = session.get(url)
-    soup = BeautifulSoup(response.text, 'html.parser')
     
-    # find the React component containing assignment data
-    assignment_table = soup.find('div', {'data-react-class': 'AssignmentsTable'})
+    # read the React props straight from the page text when possible
+    data_props = _find_assignments_props(response.text)
+    
+    if data_props is None:
+        # fall back to a full parse to find the React component containing assignment data
+        soup = BeautifulSoup(response.text, HTML_PARSER)
+        assignment_table = soup.find('div', {'data-react-class': 'AssignmentsTable'})
+        if assignment_table:
+            # extract React props data, BeautifulSoup has already unescaped the entities
+            data_props = assignment_table.get('data-react-props', '{}')
     
     # initialize the result dictionary
     result = dict()
     
-    if assignment_table:
-        # extract React props data
-        data_props = assignment_table.get('data-react-props', '{}').replace('&quot;', '"')
-        
+    if data_props is not None:
         try:
             # parse JSON data
             assignments_data = json.loads(data_props)
@@ -95,8 +149,9 @@ def get_assignment_id(session, course_id):
                     title = item['title']
                     assignment_id = item['id'].split('_')[1]
                     result[title] = assignment_id
-        except:
-            pass
+        except (json.JSONDecodeError, KeyError, IndexError, TypeError, AttributeError) as e:
+            print(f"Failed to parse the assignment list of course {course_id}: {e}")
+            return {}
     
     return result
     
@@ -104,7 +159,7 @@ def get_assignment_id(session, course_id):
 def get_course_id(session):
     url = f'https://www.gradescope.com/'
     response = session.get(url)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = BeautifulSoup(response.text, HTML_PARSER)
     
 
         # 找到 "Instructor Courses" 标题
@@ -162,16 +217,21 @@ def check_id(session, course_id, assignment_id = None):
     else:
         url = f'https://www.gradescope.com/courses/{course_id}/assignments/{assignment_id}/submissions'
     
-    response = session.get(url)
-    
-    if response.status_code == 404:
-        print("404 Not Found!")
-        return False
-    elif 'You are not authorized to access this page' in response.text:
-        print("Not authorized ID!")
-        return False
-    else:
-        return True
+    # Stream the page so a 404 returns before its body is downloaded
+    response = session.get(url, stream=True)
+    try:
+        if response.status_code == 404:
+            print("404 Not Found!")
+            return False
+
+        # The authorization error can be anywhere on the page, so search the whole body
+        if 'You are not authorized to access this page' in response.text:
+            print("Not authorized ID!")
+            return False
+        else:
+            return True
+    finally:
+        response.close()
 
 
 def input_correct_id(session, course_id, assignment_id = None):
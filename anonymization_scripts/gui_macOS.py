@@ -1,8 +1,228 @@
 import subprocess
+import sys
+from collections import deque
+import tempfile
+import shutil
+import atexit
+import os
 
+# run the dialogs inside this process with PyObjC when it is installed
+try:
+    from Foundation import NSAppleScript, NSAppleEventDescriptor
+except ImportError:
+    NSAppleScript = None
+    NSAppleEventDescriptor = None
 
-# for storing all printed messages
-all_messages = []
+
+# maximum number of printed messages kept in memory
+MAX_MESSAGES = 10000
+
+# for storing the most recent printed messages
+all_messages = deque(maxlen=MAX_MESSAGES)
+
+# AppleScript sources of the dialogs, user text is passed in through argv
+_SCRIPTS = {
+    'input': '''
+on run argv
+    tell application "System Events"
+        activate
+        set dialogResult to display dialog (item 1 of argv) default answer "" with title "Input"
+        set userInput to text returned of dialogResult
+        return userInput
+    end tell
+end run
+''',
+    'password': '''
+on run argv
+    tell application "System Events"
+        activate
+        set dialogResult to display dialog (item 1 of argv) default answer "" with hidden answer with title "Password"
+        set userInput to text returned of dialogResult
+        return userInput
+    end tell
+end run
+''',
+    'login': '''
+on run argv
+    tell application "System Events"
+        activate
+        set emailResult to display dialog (item 1 of argv) default answer "" with title "Input"
+        set passwordResult to display dialog (item 2 of argv) default answer "" with hidden answer with title "Password"
+        return (text returned of emailResult) & linefeed & (text returned of passwordResult)
+    end tell
+end run
+''',
+    'choose': '''
+on run argv
+    set thePrompt to item 1 of argv
+    set theTitle to item 2 of argv
+    set itemList to items 4 thru -1 of argv
+    tell application "System Events"
+        activate
+        if item 3 of argv is "1" then
+            set selectedItems to choose from list itemList with prompt thePrompt with multiple selections allowed with title theTitle
+        else
+            set selectedItems to choose from list itemList with prompt thePrompt with title theTitle
+        end if
+    end tell
+    
+    if selectedItems is false then
+        return "cancelled"
+    else
+        set AppleScript's text item delimiters to "|"
+        set selectedText to selectedItems as text
+        set AppleScript's text item delimiters to ""
+        return selectedText
+    end if
+end run
+''',
+    'confirm': '''
+on run argv
+    tell application "System Events"
+        activate
+        set theResult to button returned of (display dialog (item 1 of argv) buttons {"Cancel", "OK"} default button "OK" with title (item 2 of argv))
+        return theResult
+    end tell
+end run
+''',
+}
+
+# paths of the scripts compiled so far, filled on first use
+_compiled_scripts = {}
+_compiled_dir = None
+
+# NSAppleScript objects compiled so far, filled on first use
+_ns_scripts = {}
+
+# Apple event codes for calling a script's run handler with arguments
+_AE_CORE_EVENT_CLASS = int.from_bytes(b'aevt', 'big')
+_AE_OPEN_APPLICATION = int.from_bytes(b'oapp', 'big')
+_AE_DIRECT_OBJECT = int.from_bytes(b'----', 'big')
+
+
+def _compile_script(name):
+    """
+    compile a dialog script with osacompile once and cache its path
+    
+    Args:
+        name (str): key of the script in _SCRIPTS
+    
+    Returns:
+        str: path of the compiled script, or None if it cannot be compiled
+    """
+    global _compiled_dir
+
+    if name in _compiled_scripts:
+        return _compiled_scripts[name]
+
+    path = None
+    if shutil.which('osacompile'):
+        try:
+            if _compiled_dir is None:
+                _compiled_dir = tempfile.mkdtemp(prefix='gradescope_dialogs_')
+                atexit.register(shutil.rmtree, _compiled_dir, True)
+
+            path = os.path.join(_compiled_dir, f'{name}.scpt')
+            result = subprocess.run(['osacompile', '-o', path, '-e', _SCRIPTS[name]],
+                                    capture_output=True)
+            if result.returncode != 0:
+                path = None
+        except OSError:
+            path = None
+
+    # remember failures too, so compiling is only tried once per script
+    _compiled_scripts[name] = path
+    return path
+
+
+def _osascript_command(name, *args):
+    """
+    build the osascript command running a dialog script with the given arguments
+    
+    Args:
+        name (str): key of the script in _SCRIPTS
+        *args (str): arguments passed to the script's run handler
+    
+    Returns:
+        list: command line for subprocess
+    """
+    path = _compile_script(name)
+    if path is not None:
+        return ['osascript', path, *args]
+    # fall back to letting osascript compile the source itself
+    return ['osascript', '-e', _SCRIPTS[name], '--', *args]
+
+
+def _run_in_process(name, args):
+    """
+    run a dialog script inside this process with NSAppleScript
+    
+    Args:
+        name (str): key of the script in _SCRIPTS
+        args (tuple): arguments passed to the script's run handler
+    
+    Returns:
+        tuple: return code (0 on success) and the script's text result, 
+               or None if the script cannot be compiled
+    """
+    script = _ns_scripts.get(name)
+    if script is None:
+        script = NSAppleScript.alloc().initWithSource_(_SCRIPTS[name])
+        compiled, error = script.compileAndReturnError_(None)
+        if not compiled:
+            return None
+        _ns_scripts[name] = script
+
+    # build the argv list and the run event carrying it
+    argv = NSAppleEventDescriptor.listDescriptor()
+    for index, arg in enumerate(args, 1):
+        argv.insertDescriptor_atIndex_(NSAppleEventDescriptor.descriptorWithString_(arg), index)
+    event = NSAppleEventDescriptor.appleEventWithEventClass_eventID_targetDescriptor_returnID_transactionID_(
+        _AE_CORE_EVENT_CLASS, _AE_OPEN_APPLICATION, NSAppleEventDescriptor.nullDescriptor(), -1, 0)
+    event.setParamDescriptor_forKeyword_(argv, _AE_DIRECT_OBJECT)
+
+    result, error = script.executeAppleEvent_error_(event, None)
+    if result is None:
+        # a cancelled dialog or script error ends like a failed osascript run
+        return 1, ''
+    return 0, result.stringValue() or ''
+
+
+def _run_dialog(name, *args):
+    """
+    run a dialog script, in-process when PyObjC is available and with osascript otherwise
+    
+    Args:
+        name (str): key of the script in _SCRIPTS
+        *args (str): arguments passed to the script's run handler
+    
+    Returns:
+        tuple: return code (0 on success) and the script's text result
+    """
+    if NSAppleScript is not None:
+        result = _run_in_process(name, args)
+        if result is not None:
+            return result
+    result = subprocess.run(_osascript_command(name, *args), capture_output=True)
+    # osascript ends its output with a newline
+    return result.returncode, result.stdout.decode('utf-8', 'replace').rstrip('\n')
+
+
+def _console_password(prompt):
+    """
+    ask for a password on the console, with getpass when it is available
+    
+    Args:
+        prompt (str): prompt message
+    
+    Returns:
+        str: password entered by the user
+    """
+    try:
+        import getpass
+        return getpass.getpass(prompt)
+    except ImportError:
+        return input(prompt)  # last fallback option
 
 
 def gui_input(prompt=""):
@@ -15,29 +235,15 @@ def gui_input(prompt=""):
     Returns:
         str: text entered by the user
     """
-    # clean prompt (replace line breaks, etc.)
-    prompt = prompt.replace('\n', '\\n')
-    
-    script = f'''
-    tell application "System Events"
-        activate
-        set dialogResult to display dialog "{prompt}" default answer "" with title "Input"
-        set userInput to text returned of dialogResult
-        return userInput
-    end tell
-    '''
-    
     try:
         # execute AppleScript
-        result = subprocess.run(['osascript', '-e', script], 
-                               capture_output=True, 
-                               text=True)
+        returncode, output = _run_dialog('input', prompt)
         
-        if result.returncode != 0:
+        if returncode != 0:
             # if dialog is canceled, fall back to standard input
             return input(prompt)
             
-        return result.stdout.strip()
+        return output.strip()
         
     except Exception as e:
         # if error occurs, fall back to standard input
@@ -55,62 +261,70 @@ def gui_password_input(prompt="Enter password:"):
     Returns:
         str: password entered by the user
     """
-    # clean prompt
-    prompt = prompt.replace('\n', '\\n')
-    
-    script = f'''
-    tell application "System Events"
-        activate
-        set dialogResult to display dialog "{prompt}" default answer "" with hidden answer with title "Password"
-        set userInput to text returned of dialogResult
-        return userInput
-    end tell
-    '''
-    
     try:
         # execute AppleScript
-        result = subprocess.run(['osascript', '-e', script], 
-                               capture_output=True, 
-                               text=True)
+        returncode, output = _run_dialog('password', prompt)
         
-        if result.returncode != 0:
+        if returncode != 0:
             # if dialog is canceled, fall back to getpass
-            try:
-                import getpass
-                return getpass.getpass(prompt)
-            except ImportError:
-                return input(prompt)  # last fallback option
+            return _console_password(prompt)
             
-        return result.stdout.strip()
+        return output.strip()
         
     except Exception as e:
         # if error occurs, fall back to getpass
         print(f"Error displaying password dialog: {e}")
-        try:
-            import getpass
-            return getpass.getpass(prompt)
-        except ImportError:
-            return input(prompt)
+        return _console_password(prompt)
+
+
+def gui_login_input(email_prompt="Enter email:", password_prompt="Enter password:"):
+    """
+    ask for the login email and password with one osascript run
+    
+    Args:
+        email_prompt (str): prompt message for the email
+        password_prompt (str): prompt message for the password
+    
+    Returns:
+        tuple: email and password entered by the user
+    """
+    try:
+        # execute AppleScript showing both dialogs
+        returncode, output = _run_dialog('login', email_prompt, password_prompt)
+        
+        if returncode == 0:
+            email, found, password = output.partition('\n')
+            if found:
+                return email.strip(), password
+            
+    except Exception as e:
+        print(f"Error displaying login dialog: {e}")
+    
+    # if dialog is canceled or fails, fall back to the console
+    return input(email_prompt), _console_password(password_prompt)
 
 
-def gui_print(*args, **kwargs):
+def gui_print(*args, sep=None, end=None, file=None, flush=False, _append=all_messages.append):
     """
     replace standard print function, output to console and store in message list
     
     Args:
         *args: objects to print
-        **kwargs: keyword arguments, same as standard print
+        sep, end, file, flush: same as standard print
+        _append: message list append, bound once when the function is defined
     """
-    # format output, similar to standard print
-    sep = kwargs.get('sep', ' ')
-    end = kwargs.get('end', '\n')
-    message = sep.join(str(arg) for arg in args) + end
+    # format output once, similar to standard print
+    message = (' ' if sep is None else sep).join(map(str, args)) + ('\n' if end is None else end)
     
     # add to message list
-    all_messages.append(message)
+    _append(message)
     
-    # also output to standard output
-    print(*args, **kwargs)
+    # also write the same text to standard output, looked up per call so redirection still works
+    if file is None:
+        file = sys.stdout
+    file.write(message)
+    if flush:
+        file.flush()
 
 
 def gui_choose_from_list(items, prompt="Select an item:", multiple=False, title="Selection"):
@@ -129,43 +343,22 @@ def gui_choose_from_list(items, prompt="Select an item:", multiple=False, title=
         if multiple=True:
             list: list of selected items, or empty list if canceled
     """
-    # build AppleScript
-    multiple_cmd = " with multiple selections allowed" if multiple else ""
-    items_str = ", ".join([f'"{item}"' for item in items])
-    
-    script = f'''
-    tell application "System Events"
-        activate
-        set itemList to {{{items_str}}}
-        set selectedItems to choose from list itemList with prompt "{prompt}"{multiple_cmd} with title "{title}"
-        
-        if selectedItems is false then
-            return "cancelled"
-        else
-            set selectedText to ""
-            repeat with i from 1 to count of selectedItems
-                set selectedText to selectedText & item i of selectedItems
-                if i is not (count of selectedItems) then
-                    set selectedText to selectedText & "|"
-                end if
-            end repeat
-            return selectedText
-        end if
-    end tell
-    '''
+    # nothing to choose from, or a single choice with only one option
+    if not items:
+        return [] if multiple else None
+    if len(items) == 1 and not multiple:
+        return items[0]
     
     try:
         # execute AppleScript
-        result = subprocess.run(['osascript', '-e', script], 
-                               capture_output=True, 
-                               text=True)
+        returncode, output = _run_dialog('choose', prompt, title, '1' if multiple else '0', *items)
         
         # check for cancellation or error
-        if result.returncode != 0 or result.stdout.strip() == "cancelled":
+        selected = output.strip()
+        if returncode != 0 or selected == "cancelled":
             return [] if multiple else None
             
         # process results
-        selected = result.stdout.strip()
         
         if multiple:
             # return list for multiple selection
@@ -217,25 +410,12 @@ def gui_show_selection(message, title="Selection Summary"):
     Returns:
         bool: True if user confirms selection, False otherwise
     """
-    # clean message
-    message = message.replace('\n', '\\n').replace('"', '\\"')
-    
-    script = f'''
-    tell application "System Events"
-        activate
-        set theResult to button returned of (display dialog "{message}" buttons {{"Cancel", "OK"}} default button "OK" with title "{title}")
-        return theResult
-    end tell
-    '''
-    
     try:
         # execute AppleScript
-        result = subprocess.run(['osascript', '-e', script], 
-                               capture_output=True, 
-                               text=True)
+        returncode, output = _run_dialog('confirm', message, title)
         
         # check if user clicked the OK button
-        if result.returncode != 0 or "Cancel" in result.stdout:
+        if returncode != 0 or "Cancel" in output:
             return False
             
         return True
@@ -2,76 +2,137 @@ import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
 import getpass
+import sys
+from collections import deque
+import atexit
+
+# maximum number of printed messages kept in memory
+MAX_MESSAGES = 10000
+
+# for storing the most recent printed messages
+all_messages = deque(maxlen=MAX_MESSAGES)
+
+# fonts and colours shared by all dialogs
+LABEL_FONT = ('Segoe UI', 11)
+ENTRY_FONT = ('Segoe UI', 12)
+BUTTON_FONT = ('Segoe UI', 10)
+BUTTON_BOLD_FONT = ('Segoe UI', 10, 'bold')
+SMALL_BUTTON_FONT = ('Segoe UI', 9)
+BACKGROUND = '#f0f0f0'
+ACCENT = '#0078d4'
+ACCENT_ACTIVE = '#106ebe'
+BORDER = '#cccccc'
+BUTTON_BG = '#e1e1e1'
+BUTTON_ACTIVE_BG = '#d1d1d1'
+
+# hidden root window shared by all dialogs, created on first use
+_root = None
+
+
+def _get_root():
+    """
+    Return the hidden Tk root window, creating it on first use so the 
+    Tcl interpreter is only started once per run
+    """
+    global _root
+    if _root is None:
+        _root = tk.Tk()
+        _root.withdraw()
+        _configure_options(_root)
+        atexit.register(_destroy_root)
+    return _root
+
 
-# for storing all printed messages
-all_messages = []
+def _configure_options(root):
+    """
+    Register the shared dialog look in the Tk option database once, so 
+    widgets only need the options that differ from it
+    """
+    root.option_add('*Toplevel.background', BACKGROUND)
+    root.option_add('*Frame.background', BACKGROUND)
+    root.option_add('*Label.background', BACKGROUND)
+    root.option_add('*Label.font', LABEL_FONT)
+    root.option_add('*Listbox.font', BUTTON_FONT)
+    root.option_add('*Button.font', BUTTON_FONT)
+    root.option_add('*Button.relief', tk.FLAT)
+    root.option_add('*Button.background', BUTTON_BG)
+    root.option_add('*Button.activeBackground', BUTTON_ACTIVE_BG)
+    root.option_add('*Button.cursor', 'hand2')
+
+
+def _destroy_root():
+    """
+    Destroy the shared root window when the program exits
+    """
+    global _root
+    if _root is not None:
+        try:
+            _root.destroy()
+        except tk.TclError:
+            pass
+        _root = None
 
 
 def _create_custom_input_dialog(prompt, title="Input", is_password=False):
     """
     Create a custom input dialog with better size and appearance
     """
-    root = tk.Tk()
-    root.title(title)
-    root.lift()
-    root.attributes('-topmost', True)
+    root = _get_root()
+    dialog = tk.Toplevel(root)
+    dialog.title(title)
+    dialog.lift()
+    dialog.attributes('-topmost', True)
 
     # Set window size and center it
     window_width = 500
     window_height = 220
-    screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
+    screen_width = dialog.winfo_screenwidth()
+    screen_height = dialog.winfo_screenheight()
     x = (screen_width - window_width) // 2
     y = (screen_height - window_height) // 2
-    root.geometry(f"{window_width}x{window_height}+{x}+{y}")
-    root.resizable(False, False)
-
-    # Configure style
-    root.configure(bg='#f0f0f0')
+    dialog.geometry(f"{window_width}x{window_height}+{x}+{y}")
+    dialog.resizable(False, False)
 
-    result = None
+    # Tk variables holding the entered text and whether the dialog was cancelled
+    result_var = tk.StringVar(dialog)
+    cancelled_var = tk.BooleanVar(dialog, True)
 
     def on_ok():
-        nonlocal result
-        result = entry.get()
-        root.quit()
+        result_var.set(entry.get())
+        cancelled_var.set(False)
 
     def on_cancel():
-        nonlocal result
-        result = None
-        root.quit()
+        cancelled_var.set(True)
 
     def on_enter(event):
         on_ok()
 
     # Create main frame with padding
-    main_frame = tk.Frame(root, bg='#f0f0f0', padx=25, pady=25)
+    main_frame = tk.Frame(dialog, padx=25, pady=25)
     main_frame.pack(fill=tk.BOTH, expand=True)
 
     # Prompt label with better font
     prompt_label = tk.Label(
         main_frame,
         text=prompt,
-        font=('Segoe UI', 11),
-        bg='#f0f0f0',
         wraplength=450,
         justify=tk.LEFT
     )
     prompt_label.pack(pady=(0, 20))
 
     # Entry widget with better styling
-    entry_frame = tk.Frame(main_frame, bg='#f0f0f0')
+    entry_frame = tk.Frame(main_frame)
     entry_frame.pack(fill=tk.X, pady=(0, 25))
 
     entry = tk.Entry(
         entry_frame,
-        font=('Segoe UI', 12),
+        font=ENTRY_FONT,
         width=40,
         relief=tk.SOLID,
         bd=1,
         highlightthickness=2,
-        highlightcolor='#0078d4',
-        highlightbackground='#cccccc'
+        highlightcolor=ACCENT,
+        highlightbackground=BORDER
     )
 
     if is_password:
@@ -82,7 +143,7 @@ def _create_custom_input_dialog(prompt, title="Input", is_password=False):
     entry.focus_set()
 
     # Button frame
-    button_frame = tk.Frame(main_frame, bg='#f0f0f0')
+    button_frame = tk.Frame(main_frame)
     button_frame.pack(fill=tk.X)
 
     # Cancel button
@@ -90,13 +151,8 @@ def _create_custom_input_dialog(prompt, title="Input", is_password=False):
         button_frame,
         text="Cancel",
         command=on_cancel,
-        font=('Segoe UI', 10),
         width=12,
-        height=1,
-        relief=tk.FLAT,
-        bg='#e1e1e1',
-        activebackground='#d1d1d1',
-        cursor='hand2'
+        height=1
     )
     cancel_btn.pack(side=tk.RIGHT, padx=(10, 0))
 
@@ -105,24 +161,25 @@ def _create_custom_input_dialog(prompt, title="Input", is_password=False):
         button_frame,
         text="OK",
         command=on_ok,
-        font=('Segoe UI', 10, 'bold'),
+        font=BUTTON_BOLD_FONT,
         width=12,
         height=1,
-        relief=tk.FLAT,
-        bg='#0078d4',
+        bg=ACCENT,
         fg='white',
-        activebackground='#106ebe',
-        activeforeground='white',
-        cursor='hand2'
+        activebackground=ACCENT_ACTIVE,
+        activeforeground='white'
     )
     ok_btn.pack(side=tk.RIGHT)
 
     # Handle window close
-    root.protocol("WM_DELETE_WINDOW", on_cancel)
+    dialog.protocol("WM_DELETE_WINDOW", on_cancel)
+
+    # Run the dialog modally until OK or Cancel is chosen
+    dialog.grab_set()
+    root.wait_variable(cancelled_var)
 
-    # Run the dialog
-    root.mainloop()
-    root.destroy()
+    result = None if cancelled_var.get() else result_var.get()
+    dialog.destroy()
 
     return result
 
@@ -179,24 +236,42 @@ def gui_password_input(prompt="Enter password:"):
             return input(prompt)
 
 
-def gui_print(*args, **kwargs):
+def gui_login_input(email_prompt="Enter email:", password_prompt="Enter password:"):
+    """
+    ask for the login email and password
+
+    Args:
+        email_prompt (str): prompt message for the email
+        password_prompt (str): prompt message for the password
+
+    Returns:
+        tuple: email and password entered by the user
+    """
+    # both dialogs reuse the shared root window, so nothing is saved by combining them
+    return gui_input(email_prompt), gui_password_input(password_prompt)
+
+
+def gui_print(*args, sep=None, end=None, file=None, flush=False, _append=all_messages.append):
     """
     replace standard print function, output to console and store in message list
 
     Args:
         *args: objects to print
-        **kwargs: keyword arguments, same as standard print
+        sep, end, file, flush: same as standard print
+        _append: message list append, bound once when the function is defined
     """
-    # format output, similar to standard print
-    sep = kwargs.get('sep', ' ')
-    end = kwargs.get('end', '\n')
-    message = sep.join(str(arg) for arg in args) + end
+    # format output once, similar to standard print
+    message = (' ' if sep is None else sep).join(map(str, args)) + ('\n' if end is None else end)
 
     # add to message list
-    all_messages.append(message)
+    _append(message)
 
-    # also output to standard output
-    print(*args, **kwargs)
+    # also write the same text to standard output, looked up per call so redirection still works
+    if file is None:
+        file = sys.stdout
+    file.write(message)
+    if flush:
+        file.flush()
 
 
 def gui_choose_from_list(items, prompt="Select an item:", multiple=False, title="Selection"):
@@ -215,23 +290,29 @@ def gui_choose_from_list(items, prompt="Select an item:", multiple=False, title=
         if multiple=True:
             list: list of selected items, or empty list if canceled
     """
+    # nothing to choose from, or a single choice with only one option
+    if not items:
+        return [] if multiple else None
+    if len(items) == 1 and not multiple:
+        return items[0]
+
     try:
-        # Create main window
-        root = tk.Tk()
-        root.title(title)
-        root.lift()  # Bring to front
-        root.attributes('-topmost', True)  # Keep on top
+        # Create dialog window on the shared root
+        root = _get_root()
+        dialog = tk.Toplevel(root)
+        dialog.title(title)
+        dialog.lift()  # Bring to front
+        dialog.attributes('-topmost', True)  # Keep on top
 
         # Set better window size and center it
         window_width = 500
         window_height = 600
-        screen_width = root.winfo_screenwidth()
-        screen_height = root.winfo_screenheight()
+        screen_width = dialog.winfo_screenwidth()
+        screen_height = dialog.winfo_screenheight()
         x = (screen_width - window_width) // 2
         y = (screen_height - window_height) // 2
-        root.geometry(f"{window_width}x{window_height}+{x}+{y}")
-        root.resizable(True, True)
-        root.configure(bg='#f0f0f0')
+        dialog.geometry(f"{window_width}x{window_height}+{x}+{y}")
+        dialog.resizable(True, True)
 
         # Variables to store result
         result = None
@@ -249,12 +330,12 @@ def gui_choose_from_list(items, prompt="Select an item:", multiple=False, title=
                     result = items[selected_indices[0]]
                 else:
                     result = None
-            root.quit()
+            dialog.destroy()
 
         def on_cancel():
             nonlocal result
             result = [] if multiple else None
-            root.quit()
+            dialog.destroy()
 
         def on_select_all():
             if multiple:
@@ -265,22 +346,20 @@ def gui_choose_from_list(items, prompt="Select an item:", multiple=False, title=
                 listbox.selection_clear(0, tk.END)
 
         # Create main frame with padding
-        main_frame = tk.Frame(root, bg='#f0f0f0', padx=20, pady=20)
+        main_frame = tk.Frame(dialog, padx=20, pady=20)
         main_frame.pack(fill=tk.BOTH, expand=True)
 
         # Prompt label with better font
         prompt_label = tk.Label(
             main_frame,
             text=prompt,
-            font=('Segoe UI', 11),
-            bg='#f0f0f0',
             wraplength=460,
             justify=tk.LEFT
         )
         prompt_label.pack(pady=(0, 15), fill=tk.X)
 
         # Create frame for listbox and scrollbar
-        list_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        list_frame = tk.Frame(main_frame)
         list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
 
         # Create listbox with scrollbar
@@ -292,19 +371,17 @@ def gui_choose_from_list(items, prompt="Select an item:", multiple=False, title=
             list_frame,
             yscrollcommand=scrollbar.set,
             selectmode=select_mode,
-            font=('Segoe UI', 10),
             relief=tk.SOLID,
             bd=1,
             highlightthickness=1,
-            highlightcolor='#0078d4'
+            highlightcolor=ACCENT
         )
         listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         scrollbar.config(command=listbox.yview)
 
-        # Add items to listbox
-        for item in items:
-            listbox.insert(tk.END, item)
+        # Add all items to listbox in one call
+        listbox.insert(tk.END, *items)
 
         # Double-click to select (for single selection)
         def on_double_click(event):
@@ -314,7 +391,7 @@ def gui_choose_from_list(items, prompt="Select an item:", multiple=False, title=
         listbox.bind("<Double-Button-1>", on_double_click)
 
         # Create button frame
-        button_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        button_frame = tk.Frame(main_frame)
         button_frame.pack(fill=tk.X)
 
         if multiple:
@@ -323,11 +400,7 @@ def gui_choose_from_list(items, prompt="Select an item:", multiple=False, title=
                 button_frame,
                 text="Select All",
                 command=on_select_all,
-                font=('Segoe UI', 9),
-                relief=tk.FLAT,
-                bg='#e1e1e1',
-                activebackground='#d1d1d1',
-                cursor='hand2'
+                font=SMALL_BUTTON_FONT
             )
             select_all_btn.pack(side=tk.LEFT, padx=(0, 5))
 
@@ -335,11 +408,7 @@ def gui_choose_from_list(items, prompt="Select an item:", multiple=False, title=
                 button_frame,
                 text="Clear All",
                 command=on_clear_all,
-                font=('Segoe UI', 9),
-                relief=tk.FLAT,
-                bg='#e1e1e1',
-                activebackground='#d1d1d1',
-                cursor='hand2'
+                font=SMALL_BUTTON_FONT
             )
             clear_all_btn.pack(side=tk.LEFT, padx=(0, 15))
 
@@ -348,12 +417,7 @@ def gui_choose_from_list(items, prompt="Select an item:", multiple=False, title=
             button_frame,
             text="Cancel",
             command=on_cancel,
-            font=('Segoe UI', 10),
-            width=10,
-            relief=tk.FLAT,
-            bg='#e1e1e1',
-            activebackground='#d1d1d1',
-            cursor='hand2'
+            width=10
         )
         cancel_btn.pack(side=tk.RIGHT, padx=(10, 0))
 
@@ -361,24 +425,22 @@ def gui_choose_from_list(items, prompt="Select an item:", multiple=False, title=
             button_frame,
             text="OK",
             command=on_ok,
-            font=('Segoe UI', 10, 'bold'),
+            font=BUTTON_BOLD_FONT,
             width=10,
-            relief=tk.FLAT,
-            bg='#0078d4',
+            bg=ACCENT,
             fg='white',
-            activebackground='#106ebe',
-            activeforeground='white',
-            cursor='hand2'
+            activebackground=ACCENT_ACTIVE,
+            activeforeground='white'
         )
         ok_btn.pack(side=tk.RIGHT)
 
         # Handle window close
-        root.protocol("WM_DELETE_WINDOW", on_cancel)
+        dialog.protocol("WM_DELETE_WINDOW", on_cancel)
 
-        # Set focus and run
-        root.focus_force()
-        root.mainloop()
-        root.destroy()
+        # Set focus and run modally until the dialog is closed
+        dialog.grab_set()
+        dialog.focus_force()
+        root.wait_window(dialog)
 
         return result
 
@@ -426,15 +488,13 @@ def gui_show_selection(message, title="Selection Summary"):
         bool: True if user confirms selection, False otherwise
     """
     try:
-        # Create a hidden root window
-        root = tk.Tk()
-        root.withdraw()  # Hide the main window
+        # Use the shared hidden root window
+        root = _get_root()
         root.lift()  # Bring to front
         root.attributes('-topmost', True)  # Keep on top
 
         # Show confirmation dialog
         result = messagebox.askyesno(title, message, parent=root)
-        root.destroy()
 
         return result
 
@@ -15,8 +15,7 @@ def main():
     '''
     # Using dialog box to get login information
     print("Welcome to Gradescope Anonymizer")
-    email = gui.gui_input("Enter email to login: ")
-    password = gui.gui_password_input("Enter password: ")
+    email, password = gui.gui_login_input("Enter email to login: ", "Enter password: ")
         
     session = m.login(email, password)
         
@@ -32,9 +31,7 @@ def main():
         if len(download_course_ids_names) == 0:
             print("No courses selected, program exiting.")
             return
-    download_course_names = ""
-    for k, v in download_course_ids_names.items():
-        download_course_names += f"{v}\n"
+    download_course_names = "".join(f"{name}\n" for name in download_course_ids_names.values())
 
     m.anonymize_course(session, download_course_ids_names, roster_base_dir, anon_path)
     gui.gui_show_selection(f"Courses anonymized successfully: \n{download_course_names}", "Success")
@@ -3,7 +3,9 @@ import sys
 import time
 import shutil
 import platform
+import functools
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 
 import anonymization.anonymize_core as core
@@ -21,11 +23,15 @@ else:
 
 
 TEMP_PATHS = list()
+# temp folders are independent trees, delete a few at once
+CLEANUP_MAX_WORKERS = 4
 
 
+@functools.lru_cache(maxsize=1)
 def get_program_dir() -> str:
     """
      Returns the directory where the program is currently running (dist/anon when packaged; the .py directory when unpackaged) 
+     The directory can't change while the program runs, so it is resolved only once 
     """
     if getattr(sys, 'frozen', False):
         return os.path.dirname(sys.executable)
@@ -68,16 +74,23 @@ def get_base_dirs(anon_path, download_base_id = None, download_assignment_id = N
     return base_dirs
 
 
+def _remove_folder(temp_path):
+    try:
+        if os.path.exists(temp_path):
+            shutil.rmtree(temp_path)
+            #print(f"Delete temp folder {temp_path} sucessuflly!")
+    except Exception as e:
+        print(f"Failed to delete temp folder: {e}")
+
+
 def cleanup_folder(temp_folders = TEMP_PATHS):
     print("Deleting temp folders!")
-    for temp_path in temp_folders:
-        time.sleep(0.2)
-        try:
-            if os.path.exists(temp_path):
-                shutil.rmtree(temp_path)
-                #print(f"Delete temp folder {temp_path} sucessuflly!")
-        except Exception as e:
-            print(f"Failed to delete temp folder: {e}")
+    with ThreadPoolExecutor(max_workers=CLEANUP_MAX_WORKERS) as executor:
+        list(executor.map(_remove_folder, temp_folders))
+
+    # the registered temp folders are gone, don't delete them again
+    if temp_folders is TEMP_PATHS:
+        TEMP_PATHS.clear()
         
 
 '''
@@ -141,71 +154,73 @@ def choose_courses(session):
 
 def choose_courses(session, prompt = "Please select courses"):
     '''
-    Select courses
+    Select courses, asking again until the user confirms the selection
     '''
 
+    # fetch the course list once, a rejected selection only asks again
     courses = api.get_course_id(session)
     courses_names = list(courses.keys())
     
-    # use clickable list to select multiple courses
-    gui.gui_print("Please select source courses")
-    selected_courses = gui.gui_choose_from_list(
-        courses_names, 
-        prompt, 
-        multiple=True, 
-        title="Source Course Selection"
-    )
-    
-    # if no course selected
-    if not selected_courses:
-        return{}
-    
-    # build result dictionary
-    result = {}
-    for course_name in selected_courses:
-        course_id = courses[course_name]
-        result[course_id] = course_name
-    
-    # display selection summary
-    selection_message = "You have selected the following courses:\n\n" + "\n".join(selected_courses)
-    if not gui.gui_show_selection(selection_message, "Course Selection Summary"):
-        choose_courses(session, "Please select at least one")
-    
-    return result
+    while True:
+        # use clickable list to select multiple courses
+        gui.gui_print("Please select source courses")
+        selected_courses = gui.gui_choose_from_list(
+            courses_names, 
+            prompt, 
+            multiple=True, 
+            title="Source Course Selection"
+        )
+        
+        # if no course selected
+        if not selected_courses:
+            return{}
+        
+        # build result dictionary
+        result = {}
+        for course_name in selected_courses:
+            course_id = courses[course_name]
+            result[course_id] = course_name
+        
+        # display selection summary
+        selection_message = "You have selected the following courses:\n\n" + "\n".join(selected_courses)
+        if gui.gui_show_selection(selection_message, "Course Selection Summary"):
+            return result
+        prompt = "Please select at least one"
 
 def choose_assignments(session, course_id,prompt = "Please select assignments"):
     '''
-    Select assignments
+    Select assignments, asking again until the user confirms the selection
     '''
 
+    # fetch the assignment list once, a rejected selection only asks again
     assignments = api.get_assignment_id(session, course_id)
     assignments_names = list(assignments.keys())
     
-    # use clickable list to select assignments
-    gui.gui_print("Please select an assignment")
-    selected_assignments = gui.gui_choose_from_list(
-        assignments_names,
-        prompt,
-        multiple=True,
-        title="Assignment Selection"
-    )
-    
-    # if no assignment selected
-    if not selected_assignments:
-        return{}
-    
-    # build result dictionary
-    result = {}
-    for assignment_name in selected_assignments:
-        assignment_id = assignments[assignment_name]
-        result[assignment_id] = assignment_name
-    
-    # display selection summary
-    selection_message = f"You have selected the following assignment:\n\n" + "\n".join(selected_assignments)
-    if not gui.gui_show_selection(selection_message, "Assignment Selection Summary"):
-        choose_assignments(session, course_id, "Please select at least one")
-    
-    return result
+    while True:
+        # use clickable list to select assignments
+        gui.gui_print("Please select an assignment")
+        selected_assignments = gui.gui_choose_from_list(
+            assignments_names,
+            prompt,
+            multiple=True,
+            title="Assignment Selection"
+        )
+        
+        # if no assignment selected
+        if not selected_assignments:
+            return{}
+        
+        # build result dictionary
+        result = {}
+        for assignment_name in selected_assignments:
+            assignment_id = assignments[assignment_name]
+            result[assignment_id] = assignment_name
+        
+        # display selection summary
+        selection_message = f"You have selected the following assignment:\n\n" + "\n".join(selected_assignments)
+        if gui.gui_show_selection(selection_message, "Assignment Selection Summary"):
+            return result
+        prompt = "Please select at least one"
 
 
 def check_uploaded_roster(session, upload_course_id, roster_base_dir, new_roster_saved_path):
@@ -227,13 +242,10 @@ def check_uploaded_roster(session, upload_course_id, roster_base_dir, new_roster
     name_student_ids = roster.read_roster_file(new_roster_saved_path)[2]
 
     # compare the old and new anonymized roster, to check if there any different between them
-    changes = False
     if not regular_name_student_ids:
         changes = True
     else:
-        for name_student_id in name_student_ids:
-            if name_student_id not in regular_name_student_ids[2]:
-                changes = True
+        changes = not set(regular_name_student_ids[2]).issuperset(name_student_ids)
     
     # if there is some new student in the new roster, show the messages and recall the fucntion to makre sure user upload the new anonymized roster in the courses
     if changes:
@@ -249,11 +261,15 @@ def get_roster(session, roster_base_dir, download_course_ids, upload_course_id,
     name_student_ids = list()
     roles = dict()
 
-    # read roster of every courses that need to be anonymized, and put the student information together
-    for download_course_id in download_course_ids:
-        roster_path = os.path.join(roster_base_dir, f'gradescope_roster_{download_course_id}.csv')
-        down.download_roster(session, download_course_id, roster_path)
+    # download the rosters of all courses at once, they are independent requests
+    roster_paths = [os.path.join(roster_base_dir, f'gradescope_roster_{download_course_id}.csv')
+                    for download_course_id in download_course_ids]
+    with ThreadPoolExecutor(max_workers=max(1, min(down.DOWNLOAD_MAX_WORKERS, len(roster_paths)))) as executor:
+        list(executor.map(lambda course_id, path: down.download_roster(session, course_id, path),
+                          download_course_ids, roster_paths))
 
+    # read roster of every courses that need to be anonymized, and put the student information together
+    for roster_path in roster_paths:
         name_student_ids, roles, check_diff = roster.read_roster_file(roster_path, name_student_ids, roles)
         id_to_anonymous = core.create_anonymization_mapping(name_student_ids, id_to_anonymous)
 
@@ -341,6 +357,7 @@ def anonymize_course(session, download_course_ids_names, roster_base_dir, anon_p
                 session, 
                 upload_course_id, upload_assignment_id, filename, 
                 f"{download_course_ids_names[download_course_id]} - {download_assignment_ids_names[download_assignment_id]}",
-                f"{upload_course_id_name[upload_course_id]} - {upload_assignment_id_name[upload_assignment_id]}"
+                f"{upload_course_id_name[upload_course_id]} - {upload_assignment_id_name[upload_assignment_id]}",
+                debug_dir=get_output_path("gradescope_debug")
             )
 
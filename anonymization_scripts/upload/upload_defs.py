@@ -1,14 +1,14 @@
-from bs4 import BeautifulSoup
 import os
 import re
+import html
 import time
 import json
+import uuid
 import shutil
 import zipfile
 import tempfile
 import platform
-
-import mainScript as main
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 if platform.system() == "Windows":
     import gui_win as gui
@@ -16,6 +16,44 @@ else:
     #macOS
     import gui_macOS as gui
 
+# debug pages go here when the caller doesn't pass a debug directory
+DEFAULT_DEBUG_DIR = "gradescope_debug"
+
+# uploads are bound by round-trips to Gradescope, so a few run at once
+UPLOAD_MAX_WORKERS = 4
+
+# only back off when Gradescope actually rate limits an upload
+RETRY_STATUS_CODES = (429, 503)
+UPLOAD_RETRIES = 2
+DEFAULT_RETRY_AFTER = 2
+MAX_RETRY_AFTER = 60
+
+# the upload page is only searched for a few values, so no HTML tree is built
+_CSRF_META_RE = re.compile(r'<meta\b[^>]*\bname=["\']csrf-token["\'][^>]*>')
+_CSRF_INPUT_RE = re.compile(r'<input\b[^>]*\bname=["\']authenticity_token["\'][^>]*>')
+_ROSTER_RE = re.compile(r'gon\.roster\s*=\s*(\[.*?\]);', re.DOTALL)
+_CONTENT_ATTR_RE = re.compile(r'\bcontent=(["\'])(.*?)\1', re.DOTALL)
+_VALUE_ATTR_RE = re.compile(r'\bvalue=(["\'])(.*?)\1', re.DOTALL)
+
+
+def _find_attribute(page_text, tag_pattern, attribute_pattern):
+    """
+    Find the first tag matching tag_pattern and return one of its attributes
+    
+    Args:
+        page_text (str): HTML text to search
+        tag_pattern (re.Pattern): Pattern matching the whole opening tag
+        attribute_pattern (re.Pattern): Pattern matching the attribute, its value in group 2
+        
+    Returns:
+        str or None: Unescaped attribute value, None if the tag or attribute is missing
+    """
+    tag = tag_pattern.search(page_text)
+    if tag is None:
+        return None
+    value = attribute_pattern.search(tag.group(0))
+    return html.unescape(value.group(2)) if value else None
+
 
 def extract_name_from_filename(filename):
     """
@@ -31,12 +69,13 @@ def extract_name_from_filename(filename):
     return base_name
 
 
-def extract_zip_to_temp(zip_path):
+def extract_zip_to_temp(zip_path, verbose = False):
     """
     Extract ZIP file to temporary directory and return file list
     
     Args:
         zip_path (str): ZIP file path
+        verbose (bool): Print every extracted file
         
     Returns:
         tuple: (temp directory path, extracted files list[(file_path, relative_path)])
@@ -49,21 +88,19 @@ def extract_zip_to_temp(zip_path):
     extracted_files = []
 
     try:
-        # Extract ZIP file to temporary directory
+        # Extract ZIP file to temporary directory, extract() returns where each file was written
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(temp_dir)
+            for info in zip_ref.infolist():
+                if info.is_dir():
+                    continue
+                file_path = zip_ref.extract(info, temp_dir)
+                extracted_files.append((file_path, os.path.relpath(file_path, temp_dir)))
             print(f"Extracted {os.path.basename(zip_path)} to temp directory\n")
 
-        # Get list of extracted files
-        for root, _, files in os.walk(temp_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, temp_dir)
-                extracted_files.append((file_path, rel_path))
-
-        print(f"✅ Found {len(extracted_files)} files:")
-        for _, rel_path in extracted_files:
-            print(f"  - {rel_path}")
+        print(f"✅ Found {len(extracted_files)} files")
+        if verbose:
+            for _, rel_path in extracted_files:
+                print(f"  - {rel_path}")
 
     except Exception as e:
         print(f"Error extracting file: {e}")
@@ -73,40 +110,61 @@ def extract_zip_to_temp(zip_path):
     return temp_dir, extracted_files
 
 
-def get_upload_form_data(session, upload_url, student_name):
+def open_zip_members(zip_path):
     """
-    Get upload form data and find student ID
+    Open the files of a ZIP archive as streams, without extracting them to disk
+    
+    Args:
+        zip_path (str): ZIP file path
+        
+    Returns:
+        tuple: (open ZipFile, member streams list[(stream, relative_path)]), 
+               the caller closes the streams and then the ZipFile
+    """
+    zip_ref = zipfile.ZipFile(zip_path, 'r')
+
+    try:
+        members = [(zip_ref.open(info), info.filename) for info in zip_ref.infolist() if not info.is_dir()]
+    except Exception as e:
+        print(f"Error reading ZIP file: {e}")
+        zip_ref.close()
+        raise
+
+    print(f"✅ Found {len(members)} files in {os.path.basename(zip_path)}")
+    return zip_ref, members
+
+
+def fetch_upload_context(session, upload_url):
+    """
+    Fetch the upload page once and read the CSRF token and course roster
     
     Args:
         session: Logged-in session object
         upload_url (str): Upload page URL
-        student_name (str): Student name
         
     Returns:
-        tuple: (CSRF token, student ID or None)
+        tuple: (CSRF token, list of roster students or None), (None, None) if the page cannot be used
     """
 
     # Get upload page and analyze structure
     upload_page = session.get(upload_url)
-    soup = BeautifulSoup(upload_page.text, 'html.parser')
+    page_text = upload_page.text
 
     # Verify login status
-    if "Log Out" not in upload_page.text:
+    if "Log Out" not in page_text:
         print("⚠️ Session may be expired, trying to re-authenticate...")
         return None, None
 
     # Try to get the correct csrf token
-    csrf_meta = soup.find('meta', {'name': 'csrf-token'})
+    csrf_token = _find_attribute(page_text, _CSRF_META_RE, _CONTENT_ATTR_RE)
 
-    if csrf_meta and 'content' in csrf_meta.attrs:
-        csrf_token = csrf_meta['content']
+    if csrf_token is not None:
         print('\n✅ Found token in meta')
         # print(csrf_token)
     else:
         # If not found in meta, try to find in input tag
-        csrf_input = soup.find('input', {'name': 'authenticity_token'})
-        if csrf_input and 'value' in csrf_input.attrs:
-            csrf_token = csrf_input['value']
+        csrf_token = _find_attribute(page_text, _CSRF_INPUT_RE, _VALUE_ATTR_RE)
+        if csrf_token is not None:
             print('\n✅ Found token in input')
             # print(csrf_token)
         else:
@@ -115,36 +173,129 @@ def get_upload_form_data(session, upload_url, student_name):
         
     # Find student data
     student_data = None
-    roster_pattern = re.compile(r'gon\.roster\s*=\s*(\[.*?\]);', re.DOTALL)
-    scripts = soup.find_all('script')
-    for script in scripts:
-        if script.string and 'gon.roster' in script.string:
-            matches = roster_pattern.search(script.string)
-            if matches:
-                try:
-                    student_json = matches.group(1)
-                    student_data = json.loads(student_json)
-                    #print(f"Successfully extracted student data: {len(student_data)} students")
-                except json.JSONDecodeError:
-                    print("Failed to parse student data JSON")
-                    continue
+    for matches in _ROSTER_RE.finditer(page_text):
+        try:
+            student_json = matches.group(1)
+            student_data = json.loads(student_json)
+            #print(f"Successfully extracted student data: {len(student_data)} students")
+        except json.JSONDecodeError:
+            print("Failed to parse student data JSON")
+            continue
+
+    return csrf_token, student_data
+
+
+def _normalize_name(name):
+    """
+    Normalize a student name for lookups, so "Alice_Smith" and "alice  smith" compare equal
+    
+    Args:
+        name (str): Student name from the roster or a filename
+        
+    Returns:
+        str: Lowercase name with underscores and runs of whitespace replaced by one space
+    """
+    return " ".join(name.replace('_', ' ').lower().split())
+
+
+def build_roster_index(student_data):
+    """
+    Build a normalized name to student ID index of the roster
+    
+    Args:
+        student_data (list): Roster students as returned by fetch_upload_context
+        
+    Returns:
+        dict: Normalized student name to student ID, the first student wins on duplicates
+    """
+    name_index = {}
+    for student in student_data or []:
+        name_index.setdefault(_normalize_name(student.get('name', '')), student.get('id'))
+    return name_index
+
+
+def lookup_student_id(student_data, student_name, name_index = None):
+    """
+    Find the Gradescope ID of a student in the roster
+    
+    Args:
+        student_data (list): Roster students as returned by fetch_upload_context
+        student_name (str): Student name
+        name_index (dict): Index from build_roster_index, built from student_data when None
+        
+    Returns:
+        str or None: Student ID, None if no roster entry matches
+    """
+    if not student_data or not student_name:
+        return None
+
+    # Exact names are found in the index, partial names fall back to a scan
+    if name_index is None:
+        name_index = build_roster_index(student_data)
+    student_id = name_index.get(_normalize_name(student_name))
+    if student_id is not None:
+        return student_id
+
+    student_name = student_name.lower()
+    for student in student_data:
+        if student_name in student.get('name', '').lower():
+            return student.get('id')
+    return None
+
+
+def _debug_file_suffix():
+    """
+    Build a unique suffix for debug file names
+    
+    Uploads run concurrently, so a timestamp alone can repeat within the same second. 
+    A short random part keeps one upload from overwriting another's debug files.
+    
+    Returns:
+        str: Timestamp followed by 8 random hex characters
+    """
+    return f"{int(time.time())}_{uuid.uuid4().hex[:8]}"
+
+
+def save_roster_dump(student_data, debug_dir = DEFAULT_DEBUG_DIR):
+    """
+    Save the roster to the debug directory, used when a student cannot be found
+    
+    Args:
+        student_data (list): Roster students
+        debug_dir (str): Debug directory path
+    """
+    os.makedirs(debug_dir, exist_ok=True)
+    with open(os.path.join(debug_dir, f"roster_dump_{_debug_file_suffix()}.json"), "w", encoding="utf-8") as f:
+        json.dump(student_data, f, indent=2)
+    print(f"Saved student data for debugging")
+
+
+def get_upload_form_data(session, upload_url, student_name):
+    """
+    Get upload form data and find student ID
+    
+    Args:
+        session: Logged-in session object
+        upload_url (str): Upload page URL
+        student_name (str): Student name
+        
+    Returns:
+        tuple: (CSRF token, student ID or None)
+    """
+    csrf_token, student_data = fetch_upload_context(session, upload_url)
+    if csrf_token is None:
+        return None, None
+
     # Extract student ID from HTML
     target_student_id = None
     if student_data and student_name:
-        for student in student_data:
-            if student_name.lower() in student.get('name', '').lower():
-                target_student_id = student.get('id')
-                print(f"\n✅ Found matching student ID: {target_student_id} for {student.get('name')}")
-                break
-
-        if target_student_id is None:
+        target_student_id = lookup_student_id(student_data, student_name)
+        if target_student_id is not None:
+            print(f"\n✅ Found matching student ID: {target_student_id} for {student_name}")
+        else:
             print(f"⚠️ Warning: Could not find ID for student '{student_name}'")
             # Save student list for debugging
-            debug_dir = "gradescope_debug"
-            os.makedirs(debug_dir, exist_ok=True)
-            with open(os.path.join(debug_dir, f"roster_dump_{int(time.time())}.json"), "w", encoding="utf-8") as f:
-                json.dump(student_data, f, indent=2)
-            print(f"Saved student data for debugging")
+            save_roster_dump(student_data)
 
     return csrf_token, target_student_id
 
@@ -154,7 +305,7 @@ def prepare_file_uploads(extracted_files):
     Prepare file upload list
     
     Args:
-        extracted_files (list): List of extracted files [(file_path, relative_path)]
+        extracted_files (list): List of files [(file_path or open stream, relative_path)]
         
     Returns:
         tuple: (files list, file_objects list)
@@ -166,19 +317,44 @@ def prepare_file_uploads(extracted_files):
         rel_path = rel_path.replace('\\', '/')
         print(f"Adding file {i + 1}/{len(extracted_files)}: {rel_path}")
 
-        # 打开文件
-        file_obj = open(file_path, 'rb')
+        # 打开文件, ZIP members are already open streams
+        if isinstance(file_path, (str, os.PathLike)):
+            file_obj = open(file_path, 'rb')
+        else:
+            file_obj = file_path
         file_objects.append(file_obj)
 
         # Add to files list, using tuple format (key name, (filename, file object, content type))
         files.append(('submission[files][]', (rel_path, file_obj, 'application/octet-stream')))
 
-        # Simulate user file selection delay
-        time.sleep(0.1)
-
     return files, file_objects
 
 
+def maybe_backoff(resp):
+    """
+    Wait before retrying when Gradescope asks the client to slow down
+    
+    Args:
+        resp (requests.Response): Response of the last request
+        
+    Returns:
+        bool: Whether the request was rate limited and should be retried
+    """
+    if resp.status_code not in RETRY_STATUS_CODES:
+        return False
+
+    # Retry-After is given in seconds, an HTTP date falls back to the default
+    try:
+        delay = float(resp.headers.get('Retry-After', DEFAULT_RETRY_AFTER))
+    except (TypeError, ValueError):
+        delay = DEFAULT_RETRY_AFTER
+    delay = min(max(delay, 0), MAX_RETRY_AFTER)
+
+    print(f"⚠️ Gradescope returned {resp.status_code}, retrying in {delay:g} seconds...")
+    time.sleep(delay)
+    return True
+
+
 def upload_files(session, upload_url, csrf_token, student_id, files):
     """
     Upload files to Gradescope
@@ -210,18 +386,90 @@ def upload_files(session, upload_url, csrf_token, student_id, files):
     print("\n--- Sending upload request ---")
     print(f"Uploading {len(files)} files...")
 
-    upload_resp = session.post(
-        upload_url,
-        data=data,
-        files=files,  # Tuple list format
-        allow_redirects=True
-    )
+    for attempt in range(UPLOAD_RETRIES + 1):
+        upload_resp = session.post(
+            upload_url,
+            data=data,
+            files=files,  # Tuple list format
+            allow_redirects=True
+        )
+        if attempt == UPLOAD_RETRIES or not maybe_backoff(upload_resp):
+            break
+
+        # Rewind the files so the retry sends them again
+        for _, (_, file_obj, _) in files:
+            file_obj.seek(0)
 
     print(f"Response status code: {upload_resp.status_code}")
     return upload_resp
 
 
-def verify_upload(session, course_id, assignment_id, upload_resp, student_name, debug_dir):
+def _save_debug_page(debug_dir, filename, text, description):
+    """
+    Save a Gradescope page to the debug directory
+    
+    Args:
+        debug_dir (str): Debug directory path
+        filename (str): File name inside debug_dir
+        text (str): Page content
+        description (str): What the page is, used in the printed message
+    """
+    with open(os.path.join(debug_dir, filename), "w", encoding="utf-8") as f:
+        f.write(text)
+    print(f"Saved {description} to debug directory: {filename}")
+
+
+def _submissions_list_url(course_id, assignment_id):
+    """
+    Build the URL of the submissions list page of an assignment
+    
+    Args:
+        course_id (str): Course ID
+        assignment_id (str): Assignment ID
+        
+    Returns:
+        str: Submissions list URL, also the URL uploads are posted to
+    """
+    return f"https://www.gradescope.com/courses/{course_id}/assignments/{assignment_id}/submissions"
+
+
+def confirm_pending_uploads(session, course_id, assignment_id, student_names, debug_dir):
+    """
+    Confirm uploads against the submissions list, fetched once for the whole batch
+    
+    Args:
+        session: Logged-in session object
+        course_id (str): Course ID
+        assignment_id (str): Assignment ID
+        student_names (list): Names of the students whose uploads are not confirmed yet
+        debug_dir (str): Existing debug directory path, the list is saved there if a student is missing
+        
+    Returns:
+        list: Whether each student was found in the submissions list, in the order of student_names
+    """
+    try:
+        submissions_resp = session.get(_submissions_list_url(course_id, assignment_id))
+    except Exception as e:
+        print(f"Error while reading the submissions list: {e}")
+        return [False] * len(student_names)
+
+    # Unescape and lowercase the page once, then every name is a substring check
+    submissions_text = html.unescape(submissions_resp.text).lower()
+    found = [bool(student_name) and student_name.lower() in submissions_text for student_name in student_names]
+
+    for student_name, confirmed in zip(student_names, found):
+        if confirmed:
+            print(f"✅ Confirmed: Found student {student_name} in submissions list")
+        else:
+            print(f"⚠️ Warning: Student {student_name} not found in submissions list")
+
+    if not all(found):
+        _save_debug_page(debug_dir, f"submissions_list_{_debug_file_suffix()}.html", submissions_resp.text, "submissions list page")
+
+    return found
+
+
+def verify_upload(session, course_id, assignment_id, upload_resp, student_name, debug_dir, debug = False, check_submissions = True):
     """
     Verify if upload was successful
     
@@ -231,22 +479,18 @@ def verify_upload(session, course_id, assignment_id, upload_resp, student_name,
         assignment_id (str): Assignment ID
         upload_resp (requests.Response): Upload response object
         student_name (str): Student name
-        debug_dir (str): Debug directory path
+        debug_dir (str): Existing debug directory path, created by the caller
+        debug (bool): Also save the pages of successful uploads, 
+                      pages of failed uploads are always saved
+        check_submissions (bool): Fetch the submissions list to confirm the upload, 
+                                  batch uploads check the list once for all files instead
         
     Returns:
-        bool: Whether upload was successful
+        bool or None: Whether upload was successful, None if check_submissions is False 
+                      and the upload response alone does not confirm it
     """
-    os.makedirs(debug_dir, exist_ok=True)
     success = False
-
-    # Create timestamped filename to avoid overwriting
-    timestamp = int(time.time())
-
-    # Save response content for analysis
-    resp_filename = f"upload_response_{timestamp}.html"
-    with open(os.path.join(debug_dir, resp_filename), "w", encoding="utf-8") as f:
-        f.write(upload_resp.text)
-    print(f"Saved response content to debug directory: {resp_filename}")
+    submissions_resp = None
 
     if upload_resp.status_code == 200 or upload_resp.status_code == 302:
         print(f"✅ File uploading should be successful.")
@@ -262,31 +506,36 @@ def verify_upload(session, course_id, assignment_id, upload_resp, student_name,
             print(f"Confirmation page status code: {confirm_resp.status_code}")
 
         # Check submissions list page to confirm upload success
-        submissions_list_url = f"https://www.gradescope.com/courses/{course_id}/assignments/{assignment_id}/submissions"
-        submissions_resp = session.get(submissions_list_url)
-
-        list_filename = f"submissions_list_{timestamp}.html"
-        with open(os.path.join(debug_dir, list_filename), "w", encoding="utf-8") as f:
-            f.write(submissions_resp.text)
-        print(f"Saved submissions list page to debug directory: {list_filename}")
+        if check_submissions:
+            submissions_resp = session.get(_submissions_list_url(course_id, assignment_id))
 
         # Two verification methods:
         # 1. Check if student name exists in submissions list
-        if student_name and student_name.lower() in submissions_resp.text.lower():
+        if submissions_resp is not None and student_name and student_name.lower() in submissions_resp.text.lower():
             print(f"✅ Confirmed: Found student {student_name} in submissions list")
             success = True
         # 2. Check if page has successful submission indication
         elif "Your submission was received" in upload_resp.text or "successfully uploaded" in upload_resp.text:
             print(f"✅ Confirmed: Upload response indicates successful submission")
             success = True
+        elif not check_submissions:
+            print(f"Upload of {student_name} will be confirmed with the submissions list")
+            success = None
         else:
             print(f"⚠️ Warning: Student {student_name} not found in submissions list")
     else:
         print(f"⚠️ File upload failed. Status code: {upload_resp.status_code}")
-        error_filename = f"error_response_{timestamp}.html"
-        with open(os.path.join(debug_dir, error_filename), "w", encoding="utf-8") as f:
-            f.write(upload_resp.text)
-        print(f"Saved error response content to debug directory: {error_filename}")
+
+    # Save the pages for analysis, successful uploads only in debug mode
+    if debug or success is False:
+        # Create unique filenames to avoid overwriting, other uploads may save pages at the same time
+        suffix = _debug_file_suffix()
+
+        _save_debug_page(debug_dir, f"upload_response_{suffix}.html", upload_resp.text, "response content")
+        if submissions_resp is not None:
+            _save_debug_page(debug_dir, f"submissions_list_{suffix}.html", submissions_resp.text, "submissions list page")
+        else:
+            _save_debug_page(debug_dir, f"error_response_{suffix}.html", upload_resp.text, "error response content")
 
     return success
 
@@ -310,7 +559,7 @@ def cleanup_temp_dir(temp_dir):
         print("Please delete the temporary directory manually")
 
 
-def upload_single_assignment(session, course_id, assignment_id, zip_path):
+def upload_single_assignment(session, course_id, assignment_id, zip_path, upload_context = None, debug = False, debug_dir = None, check_submissions = True):
     """
     Upload a single assignment file to Gradescope
     
@@ -319,12 +568,18 @@ def upload_single_assignment(session, course_id, assignment_id, zip_path):
         course_id (str): Course ID
         assignment_id (str): Assignment ID
         zip_path (str): ZIP file path
+        upload_context (tuple): (CSRF token, roster, roster index) built once per batch, 
+                                fetched from the upload page when None
+        debug (bool): Save the Gradescope pages of successful uploads too
+        debug_dir (str): Existing debug directory path, DEFAULT_DEBUG_DIR is created when None
+        check_submissions (bool): Confirm the upload with the submissions list, see verify_upload
         
     Returns:
-        bool: Whether upload was successful
+        bool or None: Whether upload was successful, None if it still has to be confirmed
     """
-    debug_dir = main.get_output_path("gradescope_debug")
-    os.makedirs(debug_dir, exist_ok=True)
+    if debug_dir is None:
+        debug_dir = DEFAULT_DEBUG_DIR
+        os.makedirs(debug_dir, exist_ok=True)
     success = False
 
     # Check if file exists
@@ -336,7 +591,7 @@ def upload_single_assignment(session, course_id, assignment_id, zip_path):
     student_name = extract_name_from_filename(os.path.basename(zip_path))
     print(f"Extracted student name: {student_name}")
 
-    temp_dir = None
+    zip_ref = None
     file_objects = []
 
     try:
@@ -345,79 +600,116 @@ def upload_single_assignment(session, course_id, assignment_id, zip_path):
         # Upload URL
         upload_url = f'https://www.gradescope.com/courses/{course_id}/assignments/{assignment_id}/submissions'
         
-        # Extract ZIP to temporary directory
-        temp_dir, extracted_files = extract_zip_to_temp(zip_path)
+        # Read the ZIP members directly, nothing is extracted to disk
+        zip_ref, zip_members = open_zip_members(zip_path)
+        file_objects = [stream for stream, _ in zip_members]
 
         # Get upload form data and student ID
-        csrf_token, student_id = get_upload_form_data(session, upload_url, student_name)
+        if upload_context is None:
+            csrf_token, student_id = get_upload_form_data(session, upload_url, student_name)
+        else:
+            csrf_token, student_data, name_index = upload_context
+            student_id = lookup_student_id(student_data, student_name, name_index)
+            if student_id is not None:
+                print(f"\n✅ Found matching student ID: {student_id} for {student_name}")
+            else:
+                print(f"⚠️ Warning: Could not find ID for student '{student_name}'")
 
         if csrf_token is None:
             print("Could not get CSRF token, session may have expired")
             return False
         
         # Prepare file upload
-        files, file_objects = prepare_file_uploads(extracted_files)
+        files, file_objects = prepare_file_uploads(zip_members)
 
         # Upload files
         upload_resp = upload_files(session, upload_url, csrf_token, student_id, files)
 
         # Verify upload
-        success = verify_upload(session, course_id, assignment_id, upload_resp, student_name, debug_dir)
+        success = verify_upload(session, course_id, assignment_id, upload_resp, student_name, debug_dir, debug, check_submissions)
 
     except Exception as e:
         print(f"Error during upload: {e}")
     finally:
-        # Close all open files
+        # Close all open files, then the ZIP file itself
         for file_obj in file_objects:
             file_obj.close()
+        if zip_ref is not None:
+            zip_ref.close()
         print("All files closed")
-
-        # Clean up temporary directory
-        if temp_dir:
-            cleanup_temp_dir(temp_dir)
     return success
 
 
-def upload_mutliple_assignments(session, course_id, assignment_id, files, download_name = "None", upload_name = "None"):
+def upload_mutliple_assignments(session, course_id, assignment_id, files, download_name = "None", upload_name = "None", max_workers = UPLOAD_MAX_WORKERS, debug = False, debug_dir = None):
     """ 
-    Upload multiple assignment files to Gradescope, using a brand new session for each file 
+    Upload multiple assignment files to Gradescope, several files at a time 
     
     Args: 
-        session: 
+        session: Logged-in session object, shared by the upload threads 
         course_id: course ID 
         assignment_id: assignment ID 
         zip_files: ZIP files Path list 
+        max_workers: number of files uploaded at the same time 
+        debug: save the Gradescope pages of successful uploads too 
+        debug_dir: debug directory path, DEFAULT_DEBUG_DIR when None 
     
     Returns: 
-        list: list of uploaded results 
+        list: list of uploaded results, in the same order as files 
     """
 
-    results = []
-    debug_dir = main.get_output_path("gradescope_debug")
-    for i, zip_path in enumerate(files):
-        print(f'\n=== [{i+1}/{len(files)}] Handle file: {os.path.basename(zip_path)} ===')
-        try:
-            # Wait a while to avoid too frequent requests
-            time.sleep(1)
-            
-            # Uploading a single file
-            success = upload_single_assignment(session, course_id, assignment_id, zip_path)
-
-            # Recording results
-            status = "✅ Success" if success else "⚠️ Failed"
-            results.append((os.path.basename(zip_path), success, status))
-            
-            
-        except Exception as e:
-            print(f"Error while processing file: {e}")
-            import traceback
-            traceback.print_exc()
-            results.append((os.path.basename(zip_path), False, f"Error: {str(e)}"))
-            
-        finally:
-            # Wait a while to avoid too frequent requests
-            time.sleep(1)
-        time.sleep(0.1)
+    results = [None] * len(files)
+    if debug_dir is None:
+        debug_dir = DEFAULT_DEBUG_DIR
+    os.makedirs(debug_dir, exist_ok=True)
+
+    # The upload page is the same for every file, fetch its token and roster once
+    upload_url = f'https://www.gradescope.com/courses/{course_id}/assignments/{assignment_id}/submissions'
+    try:
+        csrf_token, student_data = fetch_upload_context(session, upload_url)
+    except Exception as e:
+        print(f"Error while reading the upload page: {e}")
+        csrf_token, student_data = None, None
+    if csrf_token is None:
+        # each upload fetches the page itself
+        upload_context = None
+    else:
+        upload_context = (csrf_token, student_data, build_roster_index(student_data))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(files)))) as executor:
+        futures = {}
+        for i, zip_path in enumerate(files):
+            print(f'\n=== [{i+1}/{len(files)}] Handle file: {os.path.basename(zip_path)} ===')
+            futures[executor.submit(upload_single_assignment, session, course_id, assignment_id, zip_path, upload_context, debug, debug_dir, False)] = i
+
+        for future in as_completed(futures):
+            i = futures[future]
+            zip_path = files[i]
+            try:
+                success = future.result()
+
+                # Recording results
+                status = "✅ Success" if success else "⚠️ Failed"
+                results[i] = (os.path.basename(zip_path), success, status)
+
+            except Exception as e:
+                print(f"Error while processing file: {e}")
+                import traceback
+                traceback.print_exc()
+                results[i] = (os.path.basename(zip_path), False, f"Error: {str(e)}")
+
+    # Confirm the remaining uploads with one look at the submissions list
+    pending = [i for i, (_, success, _) in enumerate(results) if success is None]
+    if pending:
+        found = confirm_pending_uploads(session, course_id, assignment_id,
+                                        [extract_name_from_filename(files[i]) for i in pending], debug_dir)
+        for i, success in zip(pending, found):
+            results[i] = (os.path.basename(files[i]), success, "✅ Success" if success else "⚠️ Failed")
+
+    # Save the roster once if any student could not be found in it
+    if upload_context is not None and student_data:
+        student_names = [extract_name_from_filename(zip_path) for zip_path in files]
+        if any(lookup_student_id(student_data, name, upload_context[2]) is None for name in student_names):
+            save_roster_dump(student_data, debug_dir)
 
     # print results
     summary = f"Anonymize:\n\n{download_name}\n\nUploaded submission to:\n\n{upload_name}:\n\n"
@@ -5,10 +5,14 @@ import tempfile
 import shutil
 import json
 import csv
+import re
 import zipfile
+import pytest
+import requests
 import requests_mock
 from unittest.mock import patch, MagicMock, mock_open
 import platform
+from pathlib import Path
 
 # Add project path to sys.path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -25,65 +29,134 @@ import anonymization_scripts.anonymization.anonymize_roster as roster
 import anonymization_scripts.anonymization.anonymize_sub as sub
 import anonymization_scripts.mainScript as main
 
-if platform.system() == "Windows":
+# gui_win needs tkinter and a Windows desktop, only import it where its tests run
+IS_WINDOWS = platform.system() == "Windows"
+if IS_WINDOWS:
     import anonymization_scripts.gui_win as gui
 
+GS_LOGIN_URL = 'https://www.gradescope.com/login'
+# Session type a successful login returns
+_RM_SESSION = requests.Session
+
+# Mock Gradescope pages shared by several tests, built once when the module loads
+_COURSE_HTML = '''
+<h1>Instructor Courses</h1>
+<div class="courseList">
+    <div class="courseList--term">2025 Spring</div>
+    <div class="courseList--coursesForTerm">
+        <a href="/courses/123456" class="courseBox">
+            <h3 class="courseBox--shortname">CS101</h3>
+        </a>
+    </div>
+</div>
+'''
+_ASSIGNMENTS_PROPS = {
+    'table_data': [
+        {'title': 'Assignment 1', 'id': 'assignment_12345'}
+    ]
+}
+_ASSIGNMENTS_HTML = f'''
+<div data-react-class="AssignmentsTable" 
+     data-react-props="{json.dumps(_ASSIGNMENTS_PROPS).replace('"', '&quot;')}">
+</div>
+'''
+# Submission filename pattern, compiled once for the file search tests
+_ZIP_RE = re.compile(r'.*\.zip', re.IGNORECASE)
+# Mock ZIP file content served by the download mocks
+_MOCK_ZIP_BYTES = b'PK' + b'\x00' * 100
+_ZIP_MEMBERS = (
+    ('assignment.py', 'print("Hello World")'),
+    ('README.txt', 'This is a test submission'),
+)
+
+
+def _make_zip(zip_path):
+    """Write a mock submission ZIP containing sample files"""
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zf:
+        for member, content in _ZIP_MEMBERS:
+            zf.writestr(member, content)
+
 
 class TestGradescopeIntegration(unittest.TestCase):
     """Comprehensive integration test class"""
     
-    def setUp(self):
-        """Set up test environment"""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_data_dir = os.path.join(self.test_dir, 'test_data')
-        os.makedirs(self.test_data_dir, exist_ok=True)
+    @classmethod
+    def setUpClass(cls):
+        """Create the read-only test data once for the whole class"""
+        cls.data_root = tempfile.mkdtemp()
+        cls.test_data_dir = os.path.join(cls.data_root, 'test_data')
+        os.makedirs(cls.test_data_dir, exist_ok=True)
         
         # Mock course and assignment data
-        self.mock_course_id = "123456"
-        self.mock_assignment_id = "789012"
-        self.mock_student_data = [
+        cls.mock_course_id = "123456"
+        cls.mock_assignment_id = "789012"
+        cls.mock_student_data = [
             {"name": "John Doe", "id": "12345"},
             {"name": "Jane Smith", "id": "67890"},
             {"name": "Bob Johnson", "id": "11111"}
         ]
         
-        # Create mock roster file
-        self.create_mock_roster()
-        self.create_mock_zip_files()
+        # Student ids matching the roster and ZIPs, mapped once for the tests that only read the mapping
+        cls.canonical_ids = ["John_Doe_12345", "Jane_Smith_67890", "Bob_Johnson_11111"]
+        cls.canonical_mapping = core.create_anonymization_mapping(cls.canonical_ids, {})
         
-    def tearDown(self):
-        """Clean up test environment"""
-        if os.path.exists(self.test_dir):
-            shutil.rmtree(self.test_dir, ignore_errors=True)
-    
-    def create_mock_roster(self):
+        # Create mock roster file
+        cls.create_mock_roster()
+        cls.create_mock_zip_files()
+        
+        # One mock adapter for the whole class, tests register the URLs they need on it
+        cls.mocker = requests_mock.Mocker()
+        cls.mocker.start()
+        cls.mocker.get(GS_LOGIN_URL, 
+                       text='<input name="authenticity_token" value="test_token">')
+        # Plain session for the API calls that do not need a login, its requests go to the mocker
+        cls.session = requests.Session()
+        
+        # The GUI tests never open a real window, patch tkinter.Tk once for the whole class
+        if IS_WINDOWS:
+            cls._tk_patcher = patch('tkinter.Tk')
+            cls.mock_tk = cls._tk_patcher.start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared test data"""
+        if IS_WINDOWS:
+            cls._tk_patcher.stop()
+        cls.session.close()
+        cls.mocker.stop()
+        shutil.rmtree(cls.data_root, ignore_errors=True)
+    
+    @pytest.fixture(autouse=True)
+    def _test_dir(self, tmp_path):
+        """Files written by a test go to its own tmp_path, pytest prunes old ones itself"""
+        self.test_dir = str(tmp_path)
+        self.mocker.reset_mock()
+    
+    @classmethod
+    def create_mock_roster(cls):
         """Create mock roster CSV file"""
-        roster_path = os.path.join(self.test_data_dir, 'roster.csv')
+        roster_path = os.path.join(cls.test_data_dir, 'roster.csv')
         with open(roster_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['First Name', 'Last Name', 'SID', 'Email', 'Role'])
-            writer.writerow(['John', 'Doe', '12345', 'john@test.edu', 'Student'])
-            writer.writerow(['Jane', 'Smith', '67890', 'jane@test.edu', 'Student'])
-            writer.writerow(['Bob', 'Johnson', '11111', 'bob@test.edu', 'Student'])
-        self.roster_path = roster_path
-    
-    def create_mock_zip_files(self):
+            csv.writer(f).writerows([
+                ['First Name', 'Last Name', 'SID', 'Email', 'Role'],
+                ['John', 'Doe', '12345', 'john@test.edu', 'Student'],
+                ['Jane', 'Smith', '67890', 'jane@test.edu', 'Student'],
+                ['Bob', 'Johnson', '11111', 'bob@test.edu', 'Student'],
+            ])
+        cls.roster_path = roster_path
+    
+    @classmethod
+    def create_mock_zip_files(cls):
         """Create mock ZIP submission files"""
-        self.zip_files = []
-        for student in self.mock_student_data:
+        cls.zip_files = []
+        for student in cls.mock_student_data:
             name_parts = student["name"].split()
             filename = f"{name_parts[0]}_{name_parts[1]}_{student['id']}.zip"
-            zip_path = os.path.join(self.test_data_dir, filename)
-            
-            # Create ZIP containing sample files
-            with zipfile.ZipFile(zip_path, 'w') as zf:
-                zf.writestr('assignment.py', 'print("Hello World")')
-                zf.writestr('README.txt', 'This is a test submission')
-            
-            self.zip_files.append(zip_path)
+            zip_path = os.path.join(cls.test_data_dir, filename)
+            _make_zip(zip_path)
+            cls.zip_files.append(zip_path)
     
-    @requests_mock.Mocker()
-    def test_01_api_anti_cache_headers(self, m):
+    def test_01_api_anti_cache_headers(self):
         """Test anti-cache header generation"""
         headers = api.anti_cache_headers()
         
@@ -99,97 +172,57 @@ class TestGradescopeIntegration(unittest.TestCase):
         self.assertEqual(headers['Pragma'], 'no-cache')
         self.assertEqual(headers['Expires'], '0')
     
-    @requests_mock.Mocker()
-    def test_02_login_to_gradescope_success(self, m):
+    def test_02_login_to_gradescope_success(self):
         """Test successful Gradescope login"""
-        # Mock login page response
-        m.get('https://www.gradescope.com/login', 
-              text='<input name="authenticity_token" value="test_token">')
-        
         # Mock successful login response
-        m.post('https://www.gradescope.com/login', 
-               text='<a href="/logout">Log Out</a>')
+        self.mocker.post(GS_LOGIN_URL, 
+                         text='<a href="/logout">Log Out</a>')
         
         session = api.login_to_gradescope('test@example.com', 'password')
         
         # Verify returned session is valid
         self.assertIsNotNone(session)
-        self.assertIsInstance(session, requests_mock.adapter.Session)
+        self.assertIsInstance(session, _RM_SESSION)
     
-    @requests_mock.Mocker()
-    def test_03_login_to_gradescope_failure(self, m):
+    def test_03_login_to_gradescope_failure(self):
         """Test login failure"""
-        # Mock login page response
-        m.get('https://www.gradescope.com/login', 
-              text='<input name="authenticity_token" value="test_token">')
-        
         # Mock login failure response
-        m.post('https://www.gradescope.com/login', 
-               text='Login failed')
+        self.mocker.post(GS_LOGIN_URL, 
+                         text='Login failed')
         
         with self.assertRaises(Exception) as context:
             api.login_to_gradescope('wrong@example.com', 'wrongpassword')
         
         self.assertIn('Login failed', str(context.exception))
     
-    @requests_mock.Mocker()
-    def test_04_get_course_id(self, m):
+    def test_04_get_course_id(self):
         """Test getting course ID"""
-        mock_html = '''
-        <h1>Instructor Courses</h1>
-        <div class="courseList">
-            <div class="courseList--term">2025 Spring</div>
-            <div class="courseList--coursesForTerm">
-                <a href="/courses/123456" class="courseBox">
-                    <h3 class="courseBox--shortname">CS101</h3>
-                </a>
-                <a href="/courses/789012" class="courseBox">
-                    <h3 class="courseBox--shortname">CS102</h3>
-                </a>
-            </div>
-        </div>
-        '''
+        self.mocker.get('https://www.gradescope.com/', text=_COURSE_HTML)
         
-        m.get('https://www.gradescope.com/', text=mock_html)
-        
-        session = requests_mock.MockAdapter().Session()
+        courses = api.get_course_id(self.session)
+        self.assertEqual(courses, {'2025 Spring - CS101': '123456'})
     
-    @requests_mock.Mocker()
-    def test_05_get_assignment_id(self, m):
+    def test_05_get_assignment_id(self):
         """Test getting assignment ID"""
-        mock_props = {
-            'table_data': [
-                {'title': 'Assignment 1', 'id': 'assignment_12345'},
-                {'title': 'Assignment 2', 'id': 'assignment_67890'}
-            ]
-        }
+        self.mocker.get(f'https://www.gradescope.com/courses/{self.mock_course_id}/assignments', 
+                        text=_ASSIGNMENTS_HTML)
         
-        mock_html = f'''
-        <div data-react-class="AssignmentsTable" 
-             data-react-props="{json.dumps(mock_props).replace('"', '&quot;')}">
-        </div>
-        '''
-        
-        m.get(f'https://www.gradescope.com/courses/{self.mock_course_id}/assignments', 
-              text=mock_html)
-        
-        session = requests_mock.MockAdapter().Session()
+        assignments = api.get_assignment_id(self.session, self.mock_course_id)
+        self.assertEqual(assignments, {'Assignment 1': '12345'})
     
-    @requests_mock.Mocker()
-    def test_06_check_id_valid(self, m):
+    def test_06_check_id_valid(self):
         """Test ID validation - valid ID"""
-        m.get(f'https://www.gradescope.com/courses/{self.mock_course_id}', 
-              status_code=200, text='Valid course page')
+        self.mocker.get(f'https://www.gradescope.com/courses/{self.mock_course_id}', 
+                        status_code=200, text='Valid course page')
         
-        session = requests_mock.MockAdapter().Session()
+        self.assertTrue(api.check_id(self.session, self.mock_course_id))
     
-    @requests_mock.Mocker()
-    def test_07_check_id_invalid(self, m):
+    def test_07_check_id_invalid(self):
         """Test ID validation - invalid ID"""
-        m.get('https://www.gradescope.com/courses/invalid', 
-              status_code=404)
+        self.mocker.get('https://www.gradescope.com/courses/invalid', 
+                        status_code=404)
         
-        session = requests_mock.MockAdapter().Session()
+        self.assertFalse(api.check_id(self.session, 'invalid'))
     def test_08_anonymization_core_generate_id(self):
         """Test anonymous ID generation"""
         student_id = "John_Doe_12345"
@@ -221,8 +254,7 @@ class TestGradescopeIntegration(unittest.TestCase):
     
     def test_10_anonymization_core_save_load_mapping(self):
         """Test mapping table save and load"""
-        student_ids = ["John_Doe_12345", "Jane_Smith_67890"]
-        mapping = core.create_anonymization_mapping(student_ids)
+        mapping = self.canonical_mapping
         
         # Save mapping table
         temp_mapping_path = os.path.join(self.test_dir, 'test_mapping.json')
@@ -276,8 +308,8 @@ class TestGradescopeIntegration(unittest.TestCase):
     def test_13_roster_create_anonymized_roster(self):
         """Test creating anonymized roster"""
         # Prepare data
-        name_student_ids = ["John_Doe_12345", "Jane_Smith_67890", "Bob_Johnson_11111"]
-        mapping = core.create_anonymization_mapping(name_student_ids)
+        name_student_ids = self.canonical_ids
+        mapping = self.canonical_mapping
         roles = {student_id: 'Student' for student_id in name_student_ids}
         
         # Create anonymized roster
@@ -293,29 +325,29 @@ class TestGradescopeIntegration(unittest.TestCase):
             rows = list(reader)
             
         self.assertEqual(len(rows), 3)
+        valid_sids = set(mapping.values())
         for row in rows:
             self.assertEqual(row['Role'], 'Student')
-            self.assertTrue(row['SID'] in mapping.values())
+            self.assertIn(row['SID'], valid_sids)
     
     def test_14_submission_find_files(self):
         """Test finding submission files"""
         # Create test directory structure
-        test_sub_dir = os.path.join(self.test_dir, 'submissions')
-        os.makedirs(test_sub_dir, exist_ok=True)
+        test_sub_dir = Path(self.test_dir) / 'submissions'
+        test_sub_dir.mkdir()
         
         # Create test files
         zip_files = ['test1.zip', 'test2.ZIP', 'other.txt']
         for filename in zip_files:
-            with open(os.path.join(test_sub_dir, filename), 'w') as f:
-                f.write('test')
+            (test_sub_dir / filename).write_text('test')
         
         # Find ZIP files
-        found_files = sub.find_submission_files(test_sub_dir, r'.*\.zip')
+        found_files = sub.find_submission_files(test_sub_dir, _ZIP_RE)
         
         # Verify results
         self.assertEqual(len(found_files), 2)  # Should find 2 zip files
         
-        found_basenames = [os.path.basename(f) for f in found_files]
+        found_basenames = {os.path.basename(f) for f in found_files}
         self.assertIn('test1.zip', found_basenames)
         self.assertIn('test2.ZIP', found_basenames)
     
@@ -336,8 +368,8 @@ class TestGradescopeIntegration(unittest.TestCase):
     def test_16_submission_anonymize_files(self):
         """Test anonymizing submission files"""
         # Prepare data
-        name_student_ids = ["John_Doe_12345", "Jane_Smith_67890", "Bob_Johnson_11111"]
-        mapping = core.create_anonymization_mapping(name_student_ids)
+        name_student_ids = self.canonical_ids
+        mapping = self.canonical_mapping
         
         # Create output directory
         output_dir = os.path.join(self.test_dir, 'anonymized')
@@ -362,8 +394,7 @@ class TestGradescopeIntegration(unittest.TestCase):
             base_name = os.path.splitext(filename)[0]
             self.assertEqual(len(base_name), 8)  # Anonymous ID length is 8
     
-    @requests_mock.Mocker()
-    def test_17_download_get_submissions(self, m):
+    def test_17_download_get_submissions(self):
         """Test getting submission list"""
         mock_html = '''
         <tr>
@@ -374,10 +405,11 @@ class TestGradescopeIntegration(unittest.TestCase):
         </tr>
         '''
         
-        m.get(f'https://www.gradescope.com/courses/{self.mock_course_id}/assignments/{self.mock_assignment_id}/submissions',
-              text=mock_html)
+        self.mocker.get(f'https://www.gradescope.com/courses/{self.mock_course_id}/assignments/{self.mock_assignment_id}/submissions',
+                        text=mock_html)
         
-        session = requests_mock.MockAdapter().Session()
+        submissions = down.get_submissions(self.session, self.mock_course_id, self.mock_assignment_id)
+        self.assertEqual(submissions, [('John Doe', '12345'), ('Jane Smith', '67890')])
     
     def test_18_download_setup_directories(self):
         """Test directory setup"""
@@ -411,8 +443,10 @@ class TestGradescopeIntegration(unittest.TestCase):
             with open(os.path.join(temp_dir, filename), 'w') as f:
                 f.write('test content')
         
-        # Mock ZipFile
+        # Mock ZipFile, the archive lists the files and extract() returns where each was written
         mock_zip_instance = MagicMock()
+        mock_zip_instance.infolist.return_value = [zipfile.ZipInfo(filename) for filename in test_files]
+        mock_zip_instance.extract.side_effect = lambda info, path: os.path.join(path, info.filename)
         mock_zipfile.return_value.__enter__.return_value = mock_zip_instance
         
         # Test extraction
@@ -430,41 +464,32 @@ class TestGradescopeIntegration(unittest.TestCase):
         
         self.assertEqual(name, "John_Doe_12345")
     
-    @patch('tkinter.Tk')
-    def test_21_gui_input(self, mock_tk):
+    @unittest.skipUnless(IS_WINDOWS, "gui_win is only used on Windows")
+    def test_21_gui_input(self):
         """Test GUI input functionality"""
-        # Mock tkinter behavior
-        mock_root = MagicMock()
-        mock_tk.return_value = mock_root
-        
         with patch('anonymization_scripts.gui_win._create_custom_input_dialog', return_value='test_input'):
             result = gui.gui_input("Test prompt")
             self.assertEqual(result, 'test_input')
     
-    @patch('tkinter.Tk')
-    def test_22_gui_password_input(self, mock_tk):
+    @unittest.skipUnless(IS_WINDOWS, "gui_win is only used on Windows")
+    def test_22_gui_password_input(self):
         """Test GUI password input"""
-        mock_root = MagicMock()
-        mock_tk.return_value = mock_root
-        
         with patch('anonymization_scripts.gui_win._create_custom_input_dialog', return_value='test_password'):
             result = gui.gui_password_input("Enter password:")
             self.assertEqual(result, 'test_password')
     
+    @unittest.skipUnless(IS_WINDOWS, "gui_win is only used on Windows")
     def test_23_gui_print(self):
         """Test GUI print functionality"""
-        # Clear message list
-        gui.all_messages.clear()
-        
         # Test printing
         test_message = "Test message"
         gui.gui_print(test_message)
         
-        # Verify message was recorded
-        self.assertIn(test_message + '\n', gui.all_messages)
+        # Verify message was recorded last, the shared message list is left as it is
+        self.assertEqual(gui.all_messages[-1], test_message + '\n')
     
-    @patch('tkinter.Tk')
-    def test_24_gui_choose_from_list(self, mock_tk):
+    @unittest.skipUnless(IS_WINDOWS, "gui_win is only used on Windows")
+    def test_24_gui_choose_from_list(self):
         """Test GUI list selection"""
         items = ['Item 1', 'Item 2', 'Item 3']
         
@@ -473,16 +498,12 @@ class TestGradescopeIntegration(unittest.TestCase):
             mock_listbox.return_value = mock_listbox_instance
             mock_listbox_instance.curselection.return_value = (0,)  # Select first item
             
-            with patch('tkinter.Tk') as mock_tk_class:
-                mock_root = MagicMock()
-                mock_tk_class.return_value = mock_root
-                
-                # Mock user selection
-                result = gui.gui_choose_from_list(items, "Choose item")
-                
-                # Due to complex GUI interactions, we mainly verify the function doesn't crash
-                # Actual return value depends on specific mock setup
-                self.assertIsNotNone(result)
+            # Mock user selection, tkinter.Tk is already patched for the class
+            result = gui.gui_choose_from_list(items, "Choose item")
+            
+            # Due to complex GUI interactions, we mainly verify the function doesn't crash
+            # Actual return value depends on specific mock setup
+            self.assertIsNotNone(result)
     
     def test_25_main_get_program_dir(self):
         """Test getting program directory"""
@@ -503,14 +524,19 @@ class TestGradescopeIntegration(unittest.TestCase):
     
     def test_27_main_get_hidden_data_path(self):
         """Test getting hidden data path"""
-        hidden_path = main.get_hidden_data_path()
-        
-        # Verify path exists
-        self.assertTrue(os.path.exists(hidden_path))
-        self.assertTrue(os.path.isdir(hidden_path))
-        
-        # Verify path is in temp paths list
-        self.assertIn(hidden_path, main.TEMP_PATHS)
+        # Create the folder under test_dir and record it in a throwaway TEMP_PATHS
+        with patch.object(main, 'TEMP_PATHS', []), \
+             patch.object(main.Path, 'home', return_value=Path(self.test_dir)), \
+             patch.dict(os.environ, {'APPDATA': self.test_dir}):
+            hidden_path = main.get_hidden_data_path()
+            
+            # Verify path exists
+            self.assertTrue(os.path.exists(hidden_path))
+            self.assertTrue(os.path.isdir(hidden_path))
+            self.assertTrue(hidden_path.startswith(self.test_dir))
+            
+            # Verify path is in temp paths list
+            self.assertIn(hidden_path, main.TEMP_PATHS)
     
     def test_28_main_get_base_dirs(self):
         """Test getting base directories"""
@@ -549,110 +575,61 @@ class TestGradescopeIntegration(unittest.TestCase):
         for folder in test_folders:
             self.assertFalse(os.path.exists(folder))
     
-    @requests_mock.Mocker()
+    @unittest.skipUnless(IS_WINDOWS, "gui_win is only used on Windows")
     @patch('anonymization_scripts.gui_win.gui_choose_from_list')
     @patch('anonymization_scripts.gui_win.gui_show_selection')
-    def test_30_main_choose_courses(self, m, mock_gui_show, mock_gui_choose):
+    def test_30_main_choose_courses(self, mock_gui_show, mock_gui_choose):
         """Test course selection functionality"""
         # Mock API response
-        mock_html = '''
-        <h1>Instructor Courses</h1>
-        <div class="courseList">
-            <div class="courseList--term">2025 Spring</div>
-            <div class="courseList--coursesForTerm">
-                <a href="/courses/123456" class="courseBox">
-                    <h3 class="courseBox--shortname">CS101</h3>
-                </a>
-            </div>
-        </div>
-        '''
-        m.get('https://www.gradescope.com/', text=mock_html)
+        self.mocker.get('https://www.gradescope.com/', text=_COURSE_HTML)
         
         # Mock GUI selection
         mock_gui_choose.return_value = ['2025 Spring - CS101']
         mock_gui_show.return_value = True
-        
-        session = requests_mock.MockAdapter().Session()
     
-    @requests_mock.Mocker()
+    @unittest.skipUnless(IS_WINDOWS, "gui_win is only used on Windows")
     @patch('anonymization_scripts.gui_win.gui_choose_from_list')
     @patch('anonymization_scripts.gui_win.gui_show_selection')
-    def test_31_main_choose_assignments(self, m, mock_gui_show, mock_gui_choose):
+    def test_31_main_choose_assignments(self, mock_gui_show, mock_gui_choose):
         """Test assignment selection functionality"""
         # Mock API response
-        mock_props = {
-            'table_data': [
-                {'title': 'Assignment 1', 'id': 'assignment_12345'}
-            ]
-        }
-        mock_html = f'''
-        <div data-react-class="AssignmentsTable" 
-             data-react-props="{json.dumps(mock_props).replace('"', '&quot;')}">
-        </div>
-        '''
-        m.get(f'https://www.gradescope.com/courses/{self.mock_course_id}/assignments', 
-              text=mock_html)
+        self.mocker.get(f'https://www.gradescope.com/courses/{self.mock_course_id}/assignments', 
+                        text=_ASSIGNMENTS_HTML)
         
         # Mock GUI selection
         mock_gui_choose.return_value = ['Assignment 1']
         mock_gui_show.return_value = True
-        
-        session = requests_mock.MockAdapter().Session()
     
-    @requests_mock.Mocker()
-    def test_32_integration_full_anonymization_workflow(self, m):
+    @pytest.mark.slow
+    def test_32_integration_full_anonymization_workflow(self):
         """Test complete anonymization workflow"""
         # 1. Mock login
-        m.get('https://www.gradescope.com/login', 
-              text='<input name="authenticity_token" value="test_token">')
-        m.post('https://www.gradescope.com/login', 
-               text='<a href="/logout">Log Out</a>')
+        self.mocker.post(GS_LOGIN_URL, 
+                         text='<a href="/logout">Log Out</a>')
         
         # 2. Mock getting courses
-        course_html = '''
-        <h1>Instructor Courses</h1>
-        <div class="courseList">
-            <div class="courseList--term">2025 Spring</div>
-            <div class="courseList--coursesForTerm">
-                <a href="/courses/123456" class="courseBox">
-                    <h3 class="courseBox--shortname">CS101</h3>
-                </a>
-            </div>
-        </div>
-        '''
-        m.get('https://www.gradescope.com/', text=course_html)
+        self.mocker.get('https://www.gradescope.com/', text=_COURSE_HTML)
         
         # 3. Mock getting assignments
-        assignment_props = {
-            'table_data': [
-                {'title': 'Assignment 1', 'id': 'assignment_12345'}
-            ]
-        }
-        assignment_html = f'''
-        <div data-react-class="AssignmentsTable" 
-             data-react-props="{json.dumps(assignment_props).replace('"', '&quot;')}">
-        </div>
-        '''
-        m.get('https://www.gradescope.com/courses/123456/assignments', text=assignment_html)
+        self.mocker.get('https://www.gradescope.com/courses/123456/assignments', text=_ASSIGNMENTS_HTML)
         
         # 4. Mock getting submission list
         submission_html = '''
         <tr><td><a href="/submissions/111">John Doe</a></td></tr>
         <tr><td><a href="/submissions/222">Jane Smith</a></td></tr>
         '''
-        m.get('https://www.gradescope.com/courses/123456/assignments/12345/submissions',
-              text=submission_html)
+        self.mocker.get('https://www.gradescope.com/courses/123456/assignments/12345/submissions',
+                        text=submission_html)
         
         # 5. Mock downloading roster
         roster_csv = 'First Name,Last Name,SID,Email,Role\nJohn,Doe,12345,john@test.edu,Student\nJane,Smith,67890,jane@test.edu,Student'
-        m.get('https://www.gradescope.com/courses/123456/memberships.csv', text=roster_csv)
+        self.mocker.get('https://www.gradescope.com/courses/123456/memberships.csv', text=roster_csv)
         
         # 6. Mock downloading ZIP files
-        zip_content = b'PK' + b'\x00' * 100  # Mock ZIP file content
-        m.get('https://www.gradescope.com/courses/123456/assignments/12345/submissions/111.zip',
-              content=zip_content)
-        m.get('https://www.gradescope.com/courses/123456/assignments/12345/submissions/222.zip',
-              content=zip_content)
+        self.mocker.get('https://www.gradescope.com/courses/123456/assignments/12345/submissions/111.zip',
+                        content=_MOCK_ZIP_BYTES)
+        self.mocker.get('https://www.gradescope.com/courses/123456/assignments/12345/submissions/222.zip',
+                        content=_MOCK_ZIP_BYTES)
         
         # Execute test
         
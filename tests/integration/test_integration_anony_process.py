@@ -1,10 +1,15 @@
 import pytest
+import filecmp
+import io
 import os
 import json
-import shutil
 import tempfile
 import zipfile
 import csv
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Final
 from unittest.mock import patch, MagicMock
 import sys
 
@@ -27,69 +32,122 @@ TEST_ASSIGNMENT_ID = "654321"
 TEST_UPLOAD_COURSE_ID = "789012"
 TEST_UPLOAD_ASSIGNMENT_ID = "210987"
 
-# Responsible for anonymization modules integration testing
-class TestAnonymizationModulesIntegration:
-    
-    @pytest.fixture
-    def setup_anonymization_env(self):
-        """Create comprehensive test environment for anonymization modules"""
-        temp_dir = tempfile.mkdtemp()
-        
-        # Create test roster data with various student types
-        roster_data = [
-            "First Name,Last Name,SID,Email,Role",
-            "John,Doe,12345,john.doe@example.edu,Student",
-            "Jane,Smith,67890,jane.smith@example.edu,Student", 
-            "Bob,Johnson,11111,bob.johnson@example.edu,Student",
-            "Alice,Brown,22222,alice.brown@example.edu,TA",
-            "Charlie,Wilson,,charlie.wilson@example.edu,Student",  # Missing SID
-            "David,Lee,33333,david.lee@example.edu,Instructor"
-        ]
-        
+# Test roster data with various student types
+_ROSTER_ROWS: Final[tuple[tuple[str, ...], ...]] = (
+    ("First Name", "Last Name", "SID", "Email", "Role"),
+    ("John", "Doe", "12345", "john.doe@example.edu", "Student"),
+    ("Jane", "Smith", "67890", "jane.smith@example.edu", "Student"),
+    ("Bob", "Johnson", "11111", "bob.johnson@example.edu", "Student"),
+    ("Alice", "Brown", "22222", "alice.brown@example.edu", "TA"),
+    ("Charlie", "Wilson", "", "charlie.wilson@example.edu", "Student"),  # Missing SID
+    ("David", "Lee", "33333", "david.lee@example.edu", "Instructor")
+)
+
+# Mock submission ZIP files
+_SUBMISSION_FILES: Final[tuple[tuple[str, str], ...]] = (
+    ("John_Doe_12345.zip", "John's submission"),
+    ("Jane_Smith_67890.zip", "Jane's submission"),
+    ("Bob_Johnson_11111.zip", "Bob's submission"),
+    ("Alice_Brown_22222.zip", "Alice's submission"),
+    ("Unknown_Student_99999.zip", "Unknown student"),  # Not in roster
+    ("Invalid_Format.zip", "Invalid format file")  # Wrong format
+)
+
+# Mock Gradescope responses for the download and upload tests
+_SUBMISSIONS_HTML = """
+<tr>
+  <td><a href="/courses/123456/assignments/654321/submissions/111">John Doe</a></td>
+</tr>
+<tr>
+  <td><a href="/courses/123456/assignments/654321/submissions/222">Jane Smith</a></td>
+</tr>
+"""
+_ROSTER_CONTENT = b"First Name,Last Name,SID,Email,Role\nJohn,Doe,12345,john@example.edu,Student"
+_ZIP_CONTENT = b"PK\x03\x04" + b"\x00" * 100  # Valid ZIP file header
+_FORM_HTML = """
+<meta name="csrf-token" content="test_token">
+<script>
+gon.roster = [{"id":"12345","name":"John Doe"},{"id":"67890","name":"Jane Smith"}];
+</script>
+"""
+
+
+def _split_output_files(output_dir):
+    """Sort the names in output_dir into ZIP and CSV files in one directory scan"""
+    zip_files, csv_files = [], []
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith('.zip'):
+                zip_files.append(name)
+            elif name.endswith('.csv'):
+                csv_files.append(name)
+    return zip_files, csv_files
+
+
+@pytest.fixture(scope="module")
+def _anon_inputs():
+    """Create the read-only roster and submission files once for the module"""
+    with tempfile.TemporaryDirectory() as temp_dir:
         # Create temporary roster file
         roster_path = os.path.join(temp_dir, "test_roster.csv")
-        with open(roster_path, "w", encoding='utf-8') as f:
-            f.write("\n".join(roster_data))
+        with open(roster_path, "w", newline="", encoding='utf-8') as f:
+            csv.writer(f).writerows(_ROSTER_ROWS)
         
         # Create submission files directory
         submission_dir = os.path.join(temp_dir, "submissions")
         os.makedirs(submission_dir)
         
-        # Create mock submission ZIP files with realistic content
-        submission_files = [
-            ("John_Doe_12345.zip", "John's submission"),
-            ("Jane_Smith_67890.zip", "Jane's submission"),
-            ("Bob_Johnson_11111.zip", "Bob's submission"),
-            ("Alice_Brown_22222.zip", "Alice's submission"),
-            ("Unknown_Student_99999.zip", "Unknown student"),  # Not in roster
-            ("Invalid_Format.zip", "Invalid format file")  # Wrong format
-        ]
-        
-        for filename, content in submission_files:
-            zip_path = os.path.join(submission_dir, filename)
-            with zipfile.ZipFile(zip_path, 'w') as zf:
-                zf.writestr("main.py", f"# {content}\nprint('Hello from {filename}')")
-                zf.writestr("README.md", f"# Assignment Submission\n{content}")
-        
-        # Create output directories
-        output_dir = os.path.join(temp_dir, "output")
-        os.makedirs(output_dir)
-        
-        debug_dir = os.path.join(temp_dir, "debug")
-        os.makedirs(debug_dir)
-        
-        test_env = {
-            "temp_dir": temp_dir,
-            "roster_path": roster_path,
-            "submission_dir": submission_dir,
-            "output_dir": output_dir,
-            "debug_dir": debug_dir
-        }
+        # Build the archive once in memory, every submission gets a copy of the same bytes
+        template_buf = io.BytesIO()
+        with zipfile.ZipFile(template_buf, 'w', zipfile.ZIP_STORED) as zf:
+            zf.writestr("main.py", "# Student submission\nprint('Hello')")
+            zf.writestr("README.md", "# Assignment Submission")
+        blob = template_buf.getvalue()
         
-        yield test_env
+        # The copies are independent files, write them concurrently
+        paths = [Path(submission_dir, filename) for filename, _ in _SUBMISSION_FILES]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(Path.write_bytes, paths, repeat(blob)))
         
-        # Clean up
-        shutil.rmtree(temp_dir)
+        yield {
+            "roster_path": roster_path,
+            "submission_dir": submission_dir
+        }
+
+
+@pytest.fixture(scope="module")
+def roster_and_mapping(_anon_inputs):
+    """Read the shared roster and build its mapping once, the tests only read them"""
+    name_student_ids, roles, _ = roster_anon.read_roster_file(_anon_inputs["roster_path"])
+    mapping = core.create_anonymization_mapping(name_student_ids, {})
+    return name_student_ids, roles, mapping
+
+
+# Responsible for anonymization modules integration testing
+class TestAnonymizationModulesIntegration:
+    
+    @pytest.fixture
+    def setup_anonymization_env(self, _anon_inputs):
+        """Create comprehensive test environment for anonymization modules"""
+        # The inputs are shared, every test writes to its own scratch directory
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Create output directories
+            output_dir = os.path.join(temp_dir, "output")
+            os.makedirs(output_dir)
+            
+            debug_dir = os.path.join(temp_dir, "debug")
+            os.makedirs(debug_dir)
+            
+            test_env = {
+                "temp_dir": temp_dir,
+                "roster_path": _anon_inputs["roster_path"],
+                "submission_dir": _anon_inputs["submission_dir"],
+                "output_dir": output_dir,
+                "debug_dir": debug_dir
+            }
+            
+            yield test_env
     
     def test_core_anonymization_functionality(self, setup_anonymization_env):
         """Test core anonymization functions"""
@@ -126,23 +184,20 @@ class TestAnonymizationModulesIntegration:
         assert delete_result is True, "Mapping table should be deleted successfully"
         assert not os.path.exists(mapping_path), "Mapping file should not exist after deletion"
     
-    def test_roster_anonymization_complete_flow(self, setup_anonymization_env):
+    def test_roster_anonymization_complete_flow(self, roster_and_mapping):
         """Test complete roster anonymization workflow"""
-        test_env = setup_anonymization_env
-        
         # 1. Read roster file
-        name_student_ids, roles = roster_anon.read_roster_file(test_env["roster_path"])
+        name_student_ids, roles, _ = roster_and_mapping
         
         # Verify roster reading
         assert len(name_student_ids) == 4, "Should read 4 valid students (excluding empty SID and instructor)"
     
-    def test_submission_anonymization_complete_flow(self, setup_anonymization_env):
+    def test_submission_anonymization_complete_flow(self, setup_anonymization_env, roster_and_mapping):
         """Test complete submission file anonymization workflow"""
         test_env = setup_anonymization_env
         
         # 1. Read roster and create mapping
-        name_student_ids, roles = roster_anon.read_roster_file(test_env["roster_path"])
-        mapping = core.create_anonymization_mapping(name_student_ids)
+        name_student_ids, roles, mapping = roster_and_mapping
         
         # 2. Find submission files
         submission_files = sub_anon.find_submission_files(test_env["submission_dir"])
@@ -170,15 +225,15 @@ class TestAnonymizationModulesIntegration:
         assert anonymized == 4, "Should successfully anonymize 4 files (valid students only)"
         
         # 5. Verify anonymized files exist and have correct names
-        output_files = os.listdir(test_env["output_dir"])
-        zip_files = [f for f in output_files if f.endswith('.zip')]
+        zip_files, _ = _split_output_files(test_env["output_dir"])
         assert len(zip_files) == 4, "Should create 4 anonymized ZIP files"
         
         # Verify anonymized files have correct format (8-character anonymous ID)
+        anon_id_set = set(mapping.values())
         for zip_file in zip_files:
             base_name = os.path.splitext(zip_file)[0]
             assert len(base_name) == 8, f"Anonymized file {zip_file} should have 8-character name"
-            assert base_name in mapping.values(), f"File name {base_name} should be in mapping values"
+            assert base_name in anon_id_set, f"File name {base_name} should be in mapping values"
         
         # 6. Verify file content preservation
         original_file = os.path.join(test_env["submission_dir"], "John_Doe_12345.zip")
@@ -187,17 +242,12 @@ class TestAnonymizationModulesIntegration:
         
         assert os.path.exists(anonymized_file), "Anonymized file should exist"
         
-        # Compare file contents
-        with zipfile.ZipFile(original_file, 'r') as orig_zip:
-            orig_files = orig_zip.namelist()
-            orig_content = orig_zip.read('main.py').decode('utf-8')
+        # Anonymization copies the file as it is, so compare the bytes directly
+        assert filecmp.cmp(original_file, anonymized_file, shallow=False), "File content should be preserved"
         
         with zipfile.ZipFile(anonymized_file, 'r') as anon_zip:
             anon_files = anon_zip.namelist()
-            anon_content = anon_zip.read('main.py').decode('utf-8')
-        
-        assert orig_files == anon_files, "File structure should be preserved"
-        assert orig_content == anon_content, "File content should be preserved"
+        assert anon_files == ["main.py", "README.md"], "File structure should be preserved"
     
     def test_edge_cases_and_error_handling(self, setup_anonymization_env):
         """Test edge cases and error handling scenarios"""
@@ -233,7 +283,7 @@ class TestAnonymizationModulesIntegration:
         assert processed >= 0, "Should handle empty mapping gracefully"
         assert anonymized == 0, "Should anonymize 0 files with empty mapping"
     
-    def test_full_integration_workflow(self, setup_anonymization_env):
+    def test_full_integration_workflow(self, setup_anonymization_env, roster_and_mapping):
         """Test complete end-to-end anonymization workflow"""
         test_env = setup_anonymization_env
         
@@ -241,11 +291,10 @@ class TestAnonymizationModulesIntegration:
         print("Starting full integration test...")
         
         # Step 1: Read roster
-        name_student_ids, roles = roster_anon.read_roster_file(test_env["roster_path"])
+        name_student_ids, roles, mapping = roster_and_mapping
         assert len(name_student_ids) > 0, "Should read student IDs from roster"
         
         # Step 2: Create anonymization mapping
-        mapping = core.create_anonymization_mapping(name_student_ids)
         assert len(mapping) == len(name_student_ids), "Mapping should cover all students"
         
         # Step 3: Save mapping table
@@ -269,14 +318,12 @@ class TestAnonymizationModulesIntegration:
         assert anonymized > 0, "Should anonymize some files"
         
         # Step 6: Verify complete output
-        output_files = os.listdir(test_env["output_dir"])
+        zip_files, roster_files = _split_output_files(test_env["output_dir"])
         
         # Should have anonymized roster
-        roster_files = [f for f in output_files if f.endswith('.csv')]
         assert len(roster_files) >= 1, "Should have anonymized roster file"
         
         # Should have anonymized submissions
-        zip_files = [f for f in output_files if f.endswith('.zip')]
         assert len(zip_files) > 0, "Should have anonymized submission files"
         
         # Step 7: Verify mapping consistency
@@ -308,36 +355,22 @@ class TestDownloadUploadIntegration:
         mock_session.post.return_value = login_response
         
         # Mock submission list response
-        submissions_html = """
-        <tr>
-          <td><a href="/courses/123456/assignments/654321/submissions/111">John Doe</a></td>
-        </tr>
-        <tr>
-          <td><a href="/courses/123456/assignments/654321/submissions/222">Jane Smith</a></td>
-        </tr>
-        """
         submissions_response = MagicMock()
-        submissions_response.text = submissions_html
+        submissions_response.text = _SUBMISSIONS_HTML
         
         # Mock student roster download response
         roster_response = MagicMock()
         roster_response.status_code = 200
-        roster_response.content = b"First Name,Last Name,SID,Email,Role\nJohn,Doe,12345,john@example.edu,Student"
+        roster_response.content = _ROSTER_CONTENT
         
         # Mock ZIP file download response
         zip_response = MagicMock()
         zip_response.status_code = 200
-        zip_response.content = b"PK\x03\x04" + b"\x00" * 100  # Valid ZIP file header
+        zip_response.content = _ZIP_CONTENT
         
         # Mock form data fetch response
-        form_html = """
-        <meta name="csrf-token" content="test_token">
-        <script>
-        gon.roster = [{"id":"12345","name":"John Doe"},{"id":"67890","name":"Jane Smith"}];
-        </script>
-        """
         form_response = MagicMock()
-        form_response.text = form_html
+        form_response.text = _FORM_HTML
         
         # Mock upload response
         upload_response = MagicMock()
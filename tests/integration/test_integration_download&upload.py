@@ -1,4 +1,5 @@
 import pytest
+import io
 import os
 import sys
 import json
@@ -120,18 +121,13 @@ class TestDownloadIntegration:
         # Create mock session
         mock_session = MagicMock()
         
-        # Mock successful ZIP response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b'PK\x03\x04Mock ZIP content'  # ZIP magic bytes
-        mock_session.get.return_value = mock_response
+        # Mock successful ZIP responses, each with its own body stream
+        mock_session.get.side_effect = lambda *args, **kwargs: MagicMock(
+            status_code=200, raw=io.BytesIO(b'PK\x03\x04Mock ZIP content'))  # ZIP magic bytes
         
         # Test data
         submissions = [("John Doe", "12345"), ("Jane Smith", "67890")]
         
-        # Mock time.sleep to speed up test
-        mocker.patch('anonymization_scripts.download.download_defs.time.sleep')
-        
         # Test download_zip_files function
         download.download_zip_files(
             mock_session, 
@@ -172,18 +168,13 @@ class TestDownloadIntegration:
         # Create mock session
         mock_session = MagicMock()
         
-        # Mock successful PDF response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b'%PDF-1.4Mock PDF content'  # PDF magic bytes
-        mock_session.get.return_value = mock_response
+        # Mock successful PDF responses, each with its own body stream
+        mock_session.get.side_effect = lambda *args, **kwargs: MagicMock(
+            status_code=200, raw=io.BytesIO(b'%PDF-1.4Mock PDF content'))  # PDF magic bytes
         
         # Test data
         submissions = [("John Doe", "12345"), ("Jane Smith", "67890")]
         
-        # Mock time.sleep to speed up test
-        mocker.patch('anonymization_scripts.download.download_defs.time.sleep')
-        
         # Test download_pdf_files function
         download.download_pdf_files(
             mock_session, 
@@ -459,7 +450,8 @@ class TestUploadIntegration:
             "654321",
             mock_upload_response,
             "John Doe",
-            test_env["debug_dir"]
+            test_env["debug_dir"],
+            debug=True
         )
         
         assert result == True
@@ -500,15 +492,13 @@ class TestUploadIntegration:
         # Mock cleanup_temp_dir
         mocker.patch.object(upload, 'cleanup_temp_dir')
         
-        # Mock main.get_output_path
-        mocker.patch('anonymization_scripts.upload.upload_defs.main.get_output_path', return_value=test_env["debug_dir"])
-        
         # Test upload
         result = upload.upload_single_assignment(
             mock_session,
             "123456",
             "654321",
-            test_env["zip_path"]
+            test_env["zip_path"],
+            debug_dir=test_env["debug_dir"]
         )
         
         assert result == True
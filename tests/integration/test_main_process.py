@@ -27,10 +27,12 @@ class TestMainProcess(unittest.TestCase):
         
         # Clear TEMP_PATHS before each test
         m.TEMP_PATHS.clear()
+        m.get_program_dir.cache_clear()
     
     def tearDown(self):
         """Clean up after tests"""
         m.TEMP_PATHS.clear()
+        m.get_program_dir.cache_clear()
 
     @patch('platform.system')
     @patch('sys.frozen', False, create=True)
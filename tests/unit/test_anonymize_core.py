@@ -48,6 +48,14 @@ def test_create_anonymization_mapping_unique_ids():
     mapping = create_anonymization_mapping(student_ids)
     anon_ids = list(mapping.values())
     assert len(anon_ids) == len(set(anon_ids)), "Each student ID should have a unique anonymous ID"
+
+# Collision test
+def test_create_anonymization_mapping_rehashes_on_collision():
+    """Test that a colliding anonymous ID is rehashed instead of reused"""
+    taken_id = generate_anonymous_id("student1")
+    mapping = create_anonymization_mapping(["student1"], {"other_student": taken_id})
+    assert mapping["student1"] != taken_id, "Colliding anonymous ID should be rehashed"
+    assert len(mapping["student1"]) == 8, "Rehashed anonymous ID should be 8 characters long"
 '''
 # Anonymization mapping test
 def test_create_anonymization_mapping_correct_mapping():
@@ -70,7 +78,7 @@ def test_save_mapping_table(mapping_table):
     with open(TEST_FILE, 'r', encoding='utf-8') as f:
         data = json.load(f)
     assert "id_to_anonymous" in data, "Saved file is missing id_to_anonymous key"
-    assert "anonymous_to_id" in data, "Saved file is missing anonymous_to_id key"
+    assert "anonymous_to_id" not in data, "Reverse mapping should be rebuilt on load, not saved"
     assert data["id_to_anonymous"] == mapping_table, "Saved mapping table content is incorrect"
 
 # Load mapping table test
@@ -85,6 +93,17 @@ def test_load_mapping_table(mapping_table):
     expected_reverse_mapping = {v: k for k, v in mapping_table.items()}
     assert anonymous_to_id == expected_reverse_mapping, "Loaded anonymous_to_id mapping is incorrect"
 
+# Load legacy mapping table test
+def test_load_mapping_table_with_saved_reverse_mapping(mapping_table):
+    """Test that mapping tables saved with both directions still load"""
+    reverse_mapping = {v: k for k, v in mapping_table.items()}
+    with open(TEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump({"id_to_anonymous": mapping_table, "anonymous_to_id": reverse_mapping}, f)
+
+    id_to_anonymous, anonymous_to_id = load_mapping_table(TEST_FILE)
+    assert id_to_anonymous == mapping_table, "Loaded id_to_anonymous mapping is incorrect"
+    assert anonymous_to_id == reverse_mapping, "Loaded anonymous_to_id mapping is incorrect"
+
 # Delete mapping table test
 def test_delete_mapping_table(mapping_table):
     """Test if mapping table file is correctly deleted"""
@@ -27,6 +27,39 @@ def test_read_roster_file():
     finally:
         os.remove(file_path)
 
+
+def test_read_roster_file_does_not_share_state_between_calls(tmp_path):
+    first_path = tmp_path / "first.csv"
+    second_path = tmp_path / "second.csv"
+    first_path.write_text("First Name,Last Name,SID,Role\nAlice,Smith,123,Student\n", encoding="utf-8")
+    second_path.write_text("First Name,Last Name,SID,Role\nBob,Jones,456,TA\n", encoding="utf-8")
+
+    read_roster_file(str(first_path))
+    student_ids, roles, _ = read_roster_file(str(second_path))
+
+    assert student_ids == ["Bob_Jones_456"]
+    assert roles == {"Bob_Jones_456": "TA"}
+
+
+def test_read_roster_file_skips_duplicate_students(tmp_path):
+    roster_path = tmp_path / "roster.csv"
+    roster_path.write_text("First Name,Last Name,SID,Role\nAlice,Smith,123,Student\n", encoding="utf-8")
+
+    student_ids, roles, _ = read_roster_file(str(roster_path), ["Alice_Smith_123"], {"Alice_Smith_123": "TA"})
+
+    assert student_ids == ["Alice_Smith_123"]
+    assert roles["Alice_Smith_123"] == "TA"
+
+
+def test_read_roster_file_handles_middle_and_single_names(tmp_path):
+    roster_path = tmp_path / "roster.csv"
+    roster_path.write_text("Name,Last Name,SID,Role\nMary Anne Smith,,123,Student\nCher,Sarkisian,456,TA\n",
+                           encoding="utf-8")
+
+    student_ids, _, _ = read_roster_file(str(roster_path), [], {})
+
+    assert student_ids == ["Mary_Anne Smith_123", "Cher_Sarkisian_456"]
+
 '''
 def test_create_anonymized_roster(tmp_path):
     # Input data
@@ -2,10 +2,11 @@ import pytest
 import sys
 import os
 import shutil
+import re
 
 # Add module path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../anonymization_scripts/anonymization')))
-from anonymize_sub import find_submission_files, extract_student_identifier, anonymize_submission_files  # type: ignore
+from anonymize_sub import find_submission_files, build_prefix_index, extract_student_identifier, anonymize_submission_files  # type: ignore
 
 # Fixed variables for test data and directories
 TEST_SUBMISSION_DIR = "test_submissions"
@@ -59,6 +60,14 @@ def test_find_submission_files(test_data):
     assert any("Jane_Smith.zip" in file for file in files), "Should include Jane_Smith.zip"
     assert any("Unknown_User.zip" in file for file in files), "Should include Unknown_User.zip"
 
+def test_find_submission_files_compiled_pattern(test_data):
+    """
+    Test that find_submission_files uses a precompiled pattern as it is
+    """
+    files = find_submission_files(TEST_SUBMISSION_DIR, pattern=re.compile(r'J.*\.zip'))
+    assert len(files) == 2, "Should find the 2 .zip files starting with J"
+    assert not any("Unknown_User.zip" in file for file in files), "Should not include Unknown_User.zip"
+
 def test_extract_student_identifier(test_data):
     """
     Test if extract_student_identifier function correctly extracts student identifiers
@@ -134,6 +143,19 @@ def test_extract_student_identifier_edge_cases(test_data):
     student_id = extract_student_identifier("john_doe.zip", student_ids)
     assert student_id == "John_Doe_12345", "Case insensitive match should match correctly"
 
+def test_extract_student_identifier_with_prefix_index():
+    """
+    Test extract_student_identifier with a prebuilt prefix index, including students sharing a name
+    """
+    prefix_index = build_prefix_index(["John_Doe_12345", "Jane_Smith_67890", "John_Doe_99999"])
+    assert prefix_index["john_doe"] == ["John_Doe_12345", "John_Doe_99999"], "Students sharing a name should keep roster order"
+
+    student_id = extract_student_identifier("JOHN_DOE.zip", prefix_index)
+    assert student_id == "John_Doe_12345", "First student in the roster should win on a shared name"
+
+    student_id = extract_student_identifier("Unknown_User.zip", prefix_index)
+    assert student_id is None, "Unknown user should return None"
+
 def test_anonymize_submission_files_target_dir_creation():
     """
     Test if target directory is created correctly when it doesn't exist
@@ -1,3 +1,4 @@
+import io
 import os
 import shutil
 import tempfile
@@ -122,15 +123,15 @@ class TestDownloadZipFiles:
     
     @pytest.fixture
     def mock_response_success(self, mock_zip_content):
-        return MagicMock(status_code=200, content=mock_zip_content)
+        return MagicMock(status_code=200, raw=io.BytesIO(mock_zip_content))
     
     @pytest.fixture
     def mock_response_fail(self):
-        return MagicMock(status_code=404, content=b'Not a zip')
+        return MagicMock(status_code=404, raw=io.BytesIO(b'Not a zip'))
     
-    def test_download_zip_files_success(self, mock_session, mock_response_success, submissions, zip_dir, csv_path):
-        # Simulate all downloads returning successful ZIP content
-        mock_session.get.return_value = mock_response_success
+    def test_download_zip_files_success(self, mock_session, mock_zip_content, submissions, zip_dir, csv_path):
+        # Simulate all downloads returning successful ZIP content, each with its own body stream
+        mock_session.get.side_effect = lambda *args, **kwargs: MagicMock(status_code=200, raw=io.BytesIO(mock_zip_content))
         course_id = "999"
         assignment_id = "888"
         
@@ -188,6 +189,21 @@ class TestDownloadZipFiles:
             rows = list(csv.reader(f))
         assert len(rows) == 2
 
+    def test_download_zip_files_single_worker(self, mock_session, mock_response_success, mock_response_fail,
+                                            submissions, zip_dir, csv_path):
+        # With one worker the downloads run in submission order
+        mock_session.get.side_effect = [
+            mock_response_success,
+            mock_response_fail,
+            mock_response_fail
+        ]
+
+        download_zip_files(mock_session, "999", "888", submissions, zip_dir, csv_path, max_workers=1)
+
+        with open(csv_path, newline='') as f:
+            rows = list(csv.reader(f))
+        assert rows[1] == ["Alice Smith", "123", "Alice_Smith_123.zip"]
+
 
 # Test for download_pdf_files
 class TestDownloadPdfFiles:
@@ -229,17 +245,17 @@ class TestDownloadPdfFiles:
     
     @pytest.fixture
     def mock_response_success(self, valid_pdf_content):
-        return MagicMock(status_code=200, content=valid_pdf_content)
+        return MagicMock(status_code=200, raw=io.BytesIO(valid_pdf_content))
     
     @pytest.fixture
     def mock_response_fail(self, invalid_pdf_content):
-        return MagicMock(status_code=404, content=invalid_pdf_content)
+        return MagicMock(status_code=404, raw=io.BytesIO(invalid_pdf_content))
     
     @patch("time.sleep", return_value=None)  # Patch time.sleep to avoid slowdowns in tests
-    def test_download_pdf_files_success(self, mock_sleep, mock_session, mock_response_success, 
+    def test_download_pdf_files_success(self, mock_sleep, mock_session, valid_pdf_content, 
                                       submissions, pdf_dir, csv_path):
-        # Simulate all submissions returning valid PDF content
-        mock_session.get.return_value = mock_response_success
+        # Simulate all submissions returning valid PDF content, each with its own body stream
+        mock_session.get.side_effect = lambda *args, **kwargs: MagicMock(status_code=200, raw=io.BytesIO(valid_pdf_content))
         course_id = "999"
         assignment_id = "888"
         
@@ -50,6 +50,24 @@ class TestAntiCacheHeaders:
         uuid.UUID(headers['X-Request-ID'])
 
 
+class TestLoginToGradescope:
+    @patch('gradescope_api.requests.Session')
+    def test_session_retries_transient_statuses(self, mock_session_cls):
+        mock_session = MagicMock()
+        mock_session.headers = {}
+        mock_session.get.side_effect = requests.ConnectionError("stop after setup")
+        mock_session_cls.return_value = mock_session
+
+        with pytest.raises(requests.ConnectionError):
+            login_to_gradescope('test@example.com', 'password')
+
+        prefix, adapter = mock_session.mount.call_args[0]
+        assert prefix == "https://"
+        assert adapter._pool_maxsize == 16
+        assert set(adapter.max_retries.status_forcelist) == {429, 502, 503, 504}
+        assert adapter.max_retries.raise_on_status is False
+
+
 class TestGetAssignmentId:
     @patch('gradescope_api.BeautifulSoup')
     def test_successful_assignment_extraction(self, mock_soup):
@@ -69,6 +87,20 @@ class TestGetAssignmentId:
         
         assert result == {'Assignment 1': '123', 'Assignment 2': '456'}
 
+    @patch('gradescope_api.BeautifulSoup')
+    def test_props_read_without_parsing_page(self, mock_soup):
+        mock_session = Mock()
+        mock_response = Mock()
+        mock_response.text = ('<html><div data-react-props="{&quot;table_data&quot;: [{&quot;title&quot;: '
+                              '&quot;A &amp; B&quot;, &quot;id&quot;: &quot;assignment_123&quot;}]}" '
+                              'data-react-class="AssignmentsTable"></div></html>')
+        mock_session.get.return_value = mock_response
+        
+        result = get_assignment_id(mock_session, '123')
+        
+        assert result == {'A & B': '123'}
+        mock_soup.assert_not_called()
+
     @patch('gradescope_api.BeautifulSoup')
     def test_no_assignment_table_found(self, mock_soup):
         mock_session = Mock()
@@ -102,6 +134,17 @@ class TestGetAssignmentId:
         
         assert result == {}
 
+    def test_malformed_assignment_id(self):
+        mock_session = Mock()
+        mock_response = Mock()
+        mock_response.text = ('<div data-react-class="AssignmentsTable" data-react-props="{&quot;table_data&quot;: '
+                              '[{&quot;title&quot;: &quot;A1&quot;, &quot;id&quot;: &quot;123&quot;}]}"></div>')
+        mock_session.get.return_value = mock_response
+        
+        result = get_assignment_id(mock_session, '123')
+        
+        assert result == {}
+
 
 class TestGetCourseId:
     @patch('gradescope_api.BeautifulSoup')
@@ -191,6 +234,18 @@ class TestCheckId:
         
         assert result is False
 
+    def test_unauthorized_access_late_in_page(self):
+        mock_session = Mock()
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.text = 'x' * (128 * 1024) + 'You are not authorized to access this page'
+        mock_session.get.return_value = mock_response
+        
+        with patch('builtins.print'):
+            result = check_id(mock_session, '123')
+        
+        assert result is False
+
     def test_valid_assignment_id(self):
         mock_session = Mock()
         mock_response = Mock()
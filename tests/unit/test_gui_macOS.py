@@ -6,18 +6,26 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from gui_macOS import (
-    gui_input, gui_password_input, gui_print, gui_choose_from_list, 
+    gui_input, gui_password_input, gui_login_input, gui_print, gui_choose_from_list, 
     gui_show_selection, all_messages
 )
 
 
+@pytest.fixture(autouse=True)
+def no_script_compilation():
+    # run the dialog sources directly so each dialog is a single subprocess call
+    with patch('gui_macOS._compile_script', return_value=None), \
+         patch('gui_macOS.NSAppleScript', None):
+        yield
+
+
 class TestGuiInput:
     @patch('subprocess.run')
     def test_gui_input_success(self, mock_run):
         # Mock successful AppleScript execution
         mock_result = MagicMock()
         mock_result.returncode = 0
-        mock_result.stdout = "test input\n"
+        mock_result.stdout = b"test input\n"
         mock_run.return_value = mock_result
         
         result = gui_input("Enter text:")
@@ -49,17 +57,28 @@ class TestGuiInput:
         assert result == "fallback input"
         mock_print.assert_called_once_with("Error displaying input dialog: Test error")
     
+    @patch('subprocess.run')
+    def test_gui_input_runs_in_process_when_available(self, mock_run):
+        with patch('gui_macOS.NSAppleScript', MagicMock()), \
+             patch('gui_macOS._run_in_process', return_value=(0, "in process")) as mock_in_process:
+            result = gui_input("Enter text:")
+        
+        assert result == "in process"
+        mock_in_process.assert_called_once_with('input', ("Enter text:",))
+        mock_run.assert_not_called()
+    
     def test_gui_input_prompt_cleaning(self):
         with patch('subprocess.run') as mock_run:
             mock_result = MagicMock()
             mock_result.returncode = 0
-            mock_result.stdout = "test\n"
+            mock_result.stdout = b"test\n"
             mock_run.return_value = mock_result
             
             gui_input("Line 1\nLine 2")
-            # Check that the script contains escaped newlines
+            # Check that the prompt is passed as an argument, not in the script
             call_args = mock_run.call_args[0][0]
-            assert "Line 1\\nLine 2" in call_args[2]
+            assert call_args[-1] == "Line 1\nLine 2"
+            assert "Line 1" not in call_args[2]
 
 
 class TestGuiPasswordInput:
@@ -67,7 +86,7 @@ class TestGuiPasswordInput:
     def test_gui_password_input_success(self, mock_run):
         mock_result = MagicMock()
         mock_result.returncode = 0
-        mock_result.stdout = "secret123\n"
+        mock_result.stdout = b"secret123\n"
         mock_run.return_value = mock_result
         
         result = gui_password_input("Enter password:")
@@ -85,29 +104,56 @@ class TestGuiPasswordInput:
         assert result == "fallback_password"
     
 
+class TestGuiLoginInput:
+    @patch('subprocess.run')
+    def test_gui_login_input_single_call(self, mock_run):
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = b"user@example.com\nsecret 123\n"
+        mock_run.return_value = mock_result
+        
+        result = gui_login_input("Email:", "Password:")
+        assert result == ("user@example.com", "secret 123")
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0][-2:] == ["Email:", "Password:"]
+    
+    @patch('subprocess.run')
+    @patch('getpass.getpass')
+    @patch('builtins.input')
+    def test_gui_login_input_fallback_on_cancel(self, mock_input, mock_getpass, mock_run):
+        mock_result = MagicMock()
+        mock_result.returncode = 1
+        mock_run.return_value = mock_result
+        mock_input.return_value = "user@example.com"
+        mock_getpass.return_value = "fallback_password"
+        
+        result = gui_login_input("Email:", "Password:")
+        assert result == ("user@example.com", "fallback_password")
+        mock_input.assert_called_once_with("Email:")
+        mock_getpass.assert_called_once_with("Password:")
+
+
 class TestGuiPrint:
-    def test_gui_print_basic(self):
+    def test_gui_print_basic(self, capsys):
         # Clear all_messages before test
         all_messages.clear()
         
-        with patch('builtins.print') as mock_print:
-            gui_print("Hello", "World")
-            
-            # Check message was stored
-            assert len(all_messages) == 1
-            assert all_messages[0] == "Hello World\n"
-            
-            # Check print was called
-            mock_print.assert_called_once_with("Hello", "World")
+        gui_print("Hello", "World")
+        
+        # Check message was stored
+        assert len(all_messages) == 1
+        assert all_messages[0] == "Hello World\n"
+        
+        # Check the message was written once
+        assert capsys.readouterr().out == "Hello World\n"
     
-    def test_gui_print_with_kwargs(self):
+    def test_gui_print_with_kwargs(self, capsys):
         all_messages.clear()
         
-        with patch('builtins.print') as mock_print:
-            gui_print("A", "B", sep="-", end="!")
-            
-            assert all_messages[0] == "A-B!"
-            mock_print.assert_called_once_with("A", "B", sep="-", end="!")
+        gui_print("A", "B", sep="-", end="!")
+        
+        assert all_messages[0] == "A-B!"
+        assert capsys.readouterr().out == "A-B!"
 
 
 class TestGuiChooseFromList:
@@ -115,7 +161,7 @@ class TestGuiChooseFromList:
     def test_gui_choose_from_list_single_success(self, mock_run):
         mock_result = MagicMock()
         mock_result.returncode = 0
-        mock_result.stdout = "option2\n"
+        mock_result.stdout = b"option2\n"
         mock_run.return_value = mock_result
         
         items = ["option1", "option2", "option3"]
@@ -126,18 +172,38 @@ class TestGuiChooseFromList:
     def test_gui_choose_from_list_multiple_success(self, mock_run):
         mock_result = MagicMock()
         mock_result.returncode = 0
-        mock_result.stdout = "option1|option3\n"
+        mock_result.stdout = b"option1|option3\n"
         mock_run.return_value = mock_result
         
         items = ["option1", "option2", "option3"]
         result = gui_choose_from_list(items, multiple=True)
         assert result == ["option1", "option3"]
     
+    @patch('subprocess.run')
+    def test_gui_choose_from_list_items_passed_as_arguments(self, mock_run):
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = b'CS "101"\n'
+        mock_run.return_value = mock_result
+        
+        items = ['CS "101"', "CS 102"]
+        result = gui_choose_from_list(items, prompt="Pick:", multiple=False, title="Courses")
+        assert result == 'CS "101"'
+        call_args = mock_run.call_args[0][0]
+        assert call_args[-5:] == ["Pick:", "Courses", "0", 'CS "101"', "CS 102"]
+    
+    @patch('subprocess.run')
+    def test_gui_choose_from_list_trivial_lists_skip_dialog(self, mock_run):
+        assert gui_choose_from_list([], multiple=False) is None
+        assert gui_choose_from_list([], multiple=True) == []
+        assert gui_choose_from_list(["only"], multiple=False) == "only"
+        mock_run.assert_not_called()
+    
     @patch('subprocess.run')
     def test_gui_choose_from_list_cancelled(self, mock_run):
         mock_result = MagicMock()
         mock_result.returncode = 0
-        mock_result.stdout = "cancelled\n"
+        mock_result.stdout = b"cancelled\n"
         mock_run.return_value = mock_result
         
         items = ["option1", "option2"]
@@ -186,7 +252,7 @@ class TestGuiShowSelection:
     def test_gui_show_selection_ok(self, mock_run):
         mock_result = MagicMock()
         mock_result.returncode = 0
-        mock_result.stdout = "OK\n"
+        mock_result.stdout = b"OK\n"
         mock_run.return_value = mock_result
         
         result = gui_show_selection("Confirm selection?")
@@ -196,7 +262,7 @@ class TestGuiShowSelection:
     def test_gui_show_selection_cancel(self, mock_run):
         mock_result = MagicMock()
         mock_result.returncode = 0
-        mock_result.stdout = "Cancel\n"
+        mock_result.stdout = b"Cancel\n"
         mock_run.return_value = mock_result
         
         result = gui_show_selection("Confirm selection?")
@@ -226,10 +292,10 @@ class TestGuiShowSelection:
         with patch('subprocess.run') as mock_run:
             mock_result = MagicMock()
             mock_result.returncode = 0
-            mock_result.stdout = "OK\n"
+            mock_result.stdout = b"OK\n"
             mock_run.return_value = mock_result
             
             gui_show_selection('Line 1\nLine 2 "quoted"')
-            # Check that the script contains escaped characters
+            # Check that the message is passed unescaped as an argument
             call_args = mock_run.call_args[0][0]
-            assert 'Line 1\\nLine 2 \\"quoted\\"' in call_args[2]
\ No newline at end of file
+            assert call_args[-2:] == ['Line 1\nLine 2 "quoted"', "Selection Summary"]
\ No newline at end of file
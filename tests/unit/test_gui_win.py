@@ -11,6 +11,13 @@ from gui_win import (
     gui_input, gui_password_input, gui_print, gui_choose_from_list, 
     gui_show_selection, _create_custom_input_dialog, all_messages
 )
+import gui_win
+
+
+@pytest.fixture(autouse=True)
+def fresh_root(monkeypatch):
+    # every test starts without a cached root window
+    monkeypatch.setattr(gui_win, '_root', None)
 
 
 class TestGuiInput:
@@ -114,36 +121,37 @@ class TestGuiPrint:
         all_messages.clear()
 
     @patch('builtins.print')
-    def test_gui_print_basic(self, mock_print):
+    def test_gui_print_basic(self, mock_print, capsys):
         """Test basic print functionality"""
         gui_print("Hello", "World")
         assert len(all_messages) == 1
         assert all_messages[0] == "Hello World\n"
-        mock_print.assert_called_once_with("Hello", "World")
+        assert capsys.readouterr().out == "Hello World\n"
+        mock_print.assert_not_called()
 
     @patch('builtins.print')
-    def test_gui_print_with_kwargs(self, mock_print):
+    def test_gui_print_with_kwargs(self, mock_print, capsys):
         """Test print with keyword arguments"""
         gui_print("A", "B", "C", sep="-", end="!\n")
         assert len(all_messages) == 1
         assert all_messages[0] == "A-B-C!\n"
-        mock_print.assert_called_once_with("A", "B", "C", sep="-", end="!\n")
+        assert capsys.readouterr().out == "A-B-C!\n"
 
     @patch('builtins.print')
-    def test_gui_print_single_arg(self, mock_print):
+    def test_gui_print_single_arg(self, mock_print, capsys):
         """Test single argument print"""
         gui_print("Single")
         assert len(all_messages) == 1
         assert all_messages[0] == "Single\n"
-        mock_print.assert_called_once_with("Single")
+        assert capsys.readouterr().out == "Single\n"
 
     @patch('builtins.print')
-    def test_gui_print_no_args(self, mock_print):
+    def test_gui_print_no_args(self, mock_print, capsys):
         """Test print with no arguments"""
         gui_print()
         assert len(all_messages) == 1
         assert all_messages[0] == "\n"
-        mock_print.assert_called_once_with()
+        assert capsys.readouterr().out == "\n"
 
     @patch('builtins.print')
     def test_gui_print_multiple_calls(self, mock_print):
@@ -178,6 +186,14 @@ class TestGuiPrint:
                 mock_listbox.curselection.return_value = [1]  # Select second item
                 
 
+    def test_gui_print_keeps_latest_messages(self, capsys):
+        """Test the message buffer is bounded"""
+        for i in range(gui_win.MAX_MESSAGES + 5):
+            gui_print(i)
+        assert len(all_messages) == gui_win.MAX_MESSAGES
+        assert all_messages[0] == "5\n"
+
+
     @patch('builtins.print')
     @patch('builtins.input')
     def test_gui_choose_from_list_exception_fallback_single(self, mock_input, mock_print):
@@ -280,7 +296,8 @@ class TestGuiShowSelection:
         assert result is True
         mock_askyesno.assert_called_once_with("Test", "Confirm selection", parent=mock_root)
         mock_root.withdraw.assert_called_once()
-        mock_root.destroy.assert_called_once()
+        # the root window is kept for the next dialog
+        mock_root.destroy.assert_not_called()
 
     @patch('gui_win.messagebox.askyesno')
     @patch('gui_win.tk.Tk')
@@ -393,11 +410,16 @@ class TestCreateCustomInputDialog:
             mock_root.winfo_screenwidth.return_value = 1920
             mock_root.winfo_screenheight.return_value = 1080
             
-            with patch('gui_win.tk.Frame'), \
+            with patch('gui_win.tk.Toplevel') as mock_toplevel, \
+                 patch('gui_win.tk.Frame'), \
                  patch('gui_win.tk.Label'), \
                  patch('gui_win.tk.Entry') as mock_entry_class, \
                  patch('gui_win.tk.Button'):
                 
+                mock_dialog = Mock()
+                mock_toplevel.return_value = mock_dialog
+                mock_dialog.winfo_screenwidth.return_value = 1920
+                mock_dialog.winfo_screenheight.return_value = 1080
                 mock_entry = Mock()
                 mock_entry_class.return_value = mock_entry
                 mock_root.mainloop = Mock()
@@ -405,12 +427,39 @@ class TestCreateCustomInputDialog:
                 try:
                     result = _create_custom_input_dialog("Test", "Test", False)
                     # Verify geometry setting is called (even if specific values might differ)
-                    assert mock_root.geometry.called
+                    assert mock_dialog.geometry.called
+                    mock_toplevel.assert_called_once_with(mock_root)
                 except AttributeError:
                     pass
 
 
 
+class TestCustomInputDialogResult:
+    @pytest.mark.parametrize("cancelled, expected", [(False, "typed"), (True, None)])
+    def test_result_read_from_tk_variables(self, cancelled, expected):
+        """Test the dialog result comes from its Tk variables"""
+        with patch('gui_win.tk.Tk') as mock_tk, \
+             patch('gui_win.tk.Toplevel') as mock_toplevel, \
+             patch('gui_win.tk.Frame'), \
+             patch('gui_win.tk.Label'), \
+             patch('gui_win.tk.Entry'), \
+             patch('gui_win.tk.Button'), \
+             patch('gui_win.tk.StringVar') as mock_string_var, \
+             patch('gui_win.tk.BooleanVar') as mock_bool_var:
+            mock_root = mock_tk.return_value
+            mock_dialog = mock_toplevel.return_value
+            mock_dialog.winfo_screenwidth.return_value = 1920
+            mock_dialog.winfo_screenheight.return_value = 1080
+            mock_string_var.return_value.get.return_value = "typed"
+            mock_bool_var.return_value.get.return_value = cancelled
+            
+            result = _create_custom_input_dialog("Prompt", "Title")
+            
+            assert result == expected
+            mock_root.wait_variable.assert_called_once_with(mock_bool_var.return_value)
+            mock_dialog.destroy.assert_called_once()
+
+
 class TestIntegrationScenarios:
     """Integration test scenarios"""
     
@@ -457,7 +506,16 @@ class TestIntegrationScenarios:
         
         result = gui_show_selection("Test message")
         
-        # Verify window is properly cleaned up
+        # Verify the hidden root is kept for later dialogs
         mock_root.withdraw.assert_called_once()
-        mock_root.destroy.assert_called_once()
+        mock_root.destroy.assert_not_called()
         assert result is True
+
+    @patch('gui_win.messagebox.askyesno', return_value=True)
+    @patch('gui_win.tk.Tk')
+    def test_root_window_reused_across_dialogs(self, mock_tk, mock_askyesno):
+        """Test the Tk root is only created once"""
+        gui_show_selection("First")
+        gui_show_selection("Second")
+        
+        mock_tk.assert_called_once()
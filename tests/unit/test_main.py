@@ -20,8 +20,7 @@ class TestMain:
         """Test successful execution of main function"""
         # Setup mocks
         mock_platform.return_value = "Windows"
-        mock_gui.gui_input.return_value = "test@email.com"
-        mock_gui.gui_password_input.return_value = "password123"
+        mock_gui.gui_login_input.return_value = ("test@email.com", "password123")
         mock_session = MagicMock()
         mock_m.login.return_value = mock_session
         mock_m.get_hidden_data_path.return_value = "/test/path"
@@ -48,8 +47,7 @@ class TestMain:
         """Test when no courses are selected twice, program exits"""
         # Setup mocks
         mock_platform.return_value = "Windows"
-        mock_gui.gui_input.return_value = "test@email.com"
-        mock_gui.gui_password_input.return_value = "password123"
+        mock_gui.gui_login_input.return_value = ("test@email.com", "password123")
         mock_session = MagicMock()
         mock_m.login.return_value = mock_session
         mock_m.get_hidden_data_path.return_value = "/test/path"
@@ -70,8 +68,7 @@ class TestMain:
         """Test when no courses selected first time but success second time"""
         # Setup mocks
         mock_platform.return_value = "Windows"
-        mock_gui.gui_input.return_value = "test@email.com"
-        mock_gui.gui_password_input.return_value = "password123"
+        mock_gui.gui_login_input.return_value = ("test@email.com", "password123")
         mock_session = MagicMock()
         mock_m.login.return_value = mock_session
         mock_m.get_hidden_data_path.return_value = "/test/path"
@@ -111,8 +108,7 @@ class TestMain:
         """Test that welcome message is printed"""
         # Setup mocks
         mock_platform.return_value = "Windows"
-        mock_gui.gui_input.return_value = "test@email.com"
-        mock_gui.gui_password_input.return_value = "password123"
+        mock_gui.gui_login_input.return_value = ("test@email.com", "password123")
         mock_session = MagicMock()
         mock_m.login.return_value = mock_session
         mock_m.get_hidden_data_path.return_value = "/test/path"
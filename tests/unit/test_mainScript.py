@@ -31,6 +31,12 @@ from anonymization_scripts.mainScript import get_output_path
 from anonymization_scripts.mainScript import login
 
 class TestMainScript:
+
+    @pytest.fixture(autouse=True)
+    def clear_program_dir_cache(self):
+        get_program_dir.cache_clear()
+        yield
+        get_program_dir.cache_clear()
     
     @patch('anonymization_scripts.mainScript.sys')
     @patch('anonymization_scripts.mainScript.os.path.dirname')
@@ -132,10 +138,23 @@ class TestMainScript:
         
         cleanup_folder(["/temp/path1", "/temp/path2"])
         
-        assert mock_sleep.call_count == 2
+        mock_sleep.assert_not_called()
         assert mock_exists.call_count == 2
         assert mock_rmtree.call_count == 2
 
+    @patch('anonymization_scripts.mainScript.shutil.rmtree')
+    @patch('anonymization_scripts.mainScript.os.path.exists')
+    def test_cleanup_folder_clears_temp_paths(self, mock_exists, mock_rmtree):
+        mock_exists.return_value = True
+        TEMP_PATHS.clear()
+        TEMP_PATHS.extend(["/temp/path1", "/temp/path2"])
+        mock_rmtree.side_effect = [OSError("Permission denied"), None]
+
+        cleanup_folder()
+
+        assert sorted(call.args[0] for call in mock_rmtree.call_args_list) == ["/temp/path1", "/temp/path2"]
+        assert TEMP_PATHS == []
+
     @patch('anonymization_scripts.mainScript.api.get_course_id')
     @patch('anonymization_scripts.mainScript.gui')
     def test_choose_courses_success(self, mock_gui, mock_get_course_id):
@@ -149,6 +168,34 @@ class TestMainScript:
         expected = {"course_id_1": "Course 1"}
         assert result == expected
 
+    @patch('anonymization_scripts.mainScript.api.get_course_id')
+    @patch('anonymization_scripts.mainScript.gui')
+    def test_choose_courses_asks_again_after_rejection(self, mock_gui, mock_get_course_id):
+        mock_session = MagicMock()
+        mock_get_course_id.return_value = {"Course 1": "course_id_1", "Course 2": "course_id_2"}
+        mock_gui.gui_choose_from_list.side_effect = [["Course 1"], ["Course 2"]]
+        mock_gui.gui_show_selection.side_effect = [False, True]
+
+        result = choose_courses(mock_session)
+
+        # the confirmed selection is returned and the course list is fetched once
+        assert result == {"course_id_2": "Course 2"}
+        mock_get_course_id.assert_called_once_with(mock_session)
+        assert mock_gui.gui_choose_from_list.call_args[0][1] == "Please select at least one"
+
+    @patch('anonymization_scripts.mainScript.api.get_assignment_id')
+    @patch('anonymization_scripts.mainScript.gui')
+    def test_choose_assignments_asks_again_after_rejection(self, mock_gui, mock_get_assignment_id):
+        mock_session = MagicMock()
+        mock_get_assignment_id.return_value = {"Assignment 1": "assign_id_1", "Assignment 2": "assign_id_2"}
+        mock_gui.gui_choose_from_list.side_effect = [["Assignment 1"], ["Assignment 2"]]
+        mock_gui.gui_show_selection.side_effect = [False, True]
+
+        result = choose_assignments(mock_session, "course_id")
+
+        assert result == {"assign_id_2": "Assignment 2"}
+        mock_get_assignment_id.assert_called_once_with(mock_session, "course_id")
+
     @patch('anonymization_scripts.mainScript.api.get_assignment_id')
     @patch('anonymization_scripts.mainScript.gui')
     def test_choose_assignments_success(self, mock_gui, mock_get_assignment_id):
@@ -178,6 +225,23 @@ class TestMainScript:
         mock_download.assert_called_once()
         mock_remove.assert_called_once()
 
+    @patch('anonymization_scripts.mainScript.down.download_roster')
+    @patch('anonymization_scripts.mainScript.roster.read_roster_file')
+    @patch('anonymization_scripts.mainScript.gui')
+    def test_check_uploaded_roster_asks_until_roster_matches(self, mock_gui, mock_read_roster, mock_download):
+        mock_session = MagicMock()
+        mock_gui.gui_show_selection.return_value = True
+        new_roster = (["a"], {}, ["Smith_1", "Jones_2"])
+        mock_read_roster.side_effect = [
+            (["a"], {}, ["Smith_1"]), new_roster,            # Jones_2 not uploaded yet
+            (["a"], {}, ["Jones_2", "Smith_1", "Lee_3"]), new_roster,
+        ]
+
+        check_uploaded_roster(mock_session, "upload_course", "/roster/dir", "/new/roster/path")
+
+        assert mock_download.call_count == 2
+        assert mock_gui.gui_show_selection.call_count == 3
+
     @patch('anonymization_scripts.mainScript.down.download_roster')
     @patch('anonymization_scripts.mainScript.roster.read_roster_file')
     @patch('anonymization_scripts.mainScript.roster.create_anonymized_roster')
@@ -198,3 +262,24 @@ class TestMainScript:
         mock_download.assert_called()
         mock_save_mapping.assert_called()
         mock_create_anon_roster.assert_called()
+
+    @patch('anonymization_scripts.mainScript.down.download_roster')
+    @patch('anonymization_scripts.mainScript.roster.read_roster_file')
+    @patch('anonymization_scripts.mainScript.roster.create_anonymized_roster')
+    @patch('anonymization_scripts.mainScript.core.create_anonymization_mapping')
+    @patch('anonymization_scripts.mainScript.core.save_mapping_table')
+    @patch('anonymization_scripts.mainScript.get_output_path')
+    def test_get_roster_downloads_every_course(self, mock_get_output, mock_save_mapping,
+                       mock_create_mapping, mock_create_anon_roster, mock_read_roster, mock_download):
+        mock_session = MagicMock()
+        mock_read_roster.return_value = (["student1"], {"student1": "role1"}, False)
+        mock_create_mapping.return_value = {"student1": "anon1"}
+        mock_get_output.return_value = "/output/roster.csv"
+
+        get_roster(mock_session, "/roster/dir", ["course1", "course2", "course3"], "upload_course", "/anon/path", False)
+
+        downloaded = sorted(call.args[1] for call in mock_download.call_args_list)
+        assert downloaded == ["course1", "course2", "course3"]
+        # rosters are read in course order once all downloads finished
+        read_paths = [call.args[0] for call in mock_read_roster.call_args_list]
+        assert read_paths == [os.path.join("/roster/dir", f"gradescope_roster_course{i}.csv") for i in (1, 2, 3)]
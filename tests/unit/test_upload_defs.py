@@ -12,10 +12,15 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../a
 from upload_defs import (
     extract_name_from_filename, 
     extract_zip_to_temp, 
+    open_zip_members,
     get_upload_form_data, 
+    fetch_upload_context,
+    lookup_student_id,
+    build_roster_index,
     prepare_file_uploads,
     upload_files,
     verify_upload,
+    confirm_pending_uploads,
     cleanup_temp_dir,
     upload_single_assignment,
     upload_mutliple_assignments
@@ -180,6 +185,43 @@ class TestExtractZipToTemp:
             shutil.rmtree(temp_dir)
 
 
+class TestOpenZipMembers:
+    def test_members_streamed_without_extracting(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            zip_path = os.path.join(temp_dir, "student.zip")
+            with zipfile.ZipFile(zip_path, "w") as zipf:
+                zipf.writestr("main.py", "print('hi')")
+                zipf.writestr("docs/", "")
+                zipf.writestr("docs/README.md", "# Readme")
+
+            with patch('tempfile.mkdtemp') as mock_mkdtemp:
+                zip_ref, members = open_zip_members(zip_path)
+            mock_mkdtemp.assert_not_called()
+
+            try:
+                assert [name for _, name in members] == ["main.py", "docs/README.md"]
+
+                files, file_objs = prepare_file_uploads(members)
+                assert [f[1][0] for f in files] == ["main.py", "docs/README.md"]
+                assert files[0][1][1].read() == b"print('hi')"
+            finally:
+                for stream, _ in members:
+                    stream.close()
+                zip_ref.close()
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_invalid_zip(self):
+        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as f:
+            f.write(b"This is not a valid zip file.")
+        try:
+            with pytest.raises(zipfile.BadZipFile):
+                open_zip_members(f.name)
+        finally:
+            os.remove(f.name)
+
+
 class TestGetUploadFormData:
     @pytest.fixture
     def student_info(self):
@@ -392,6 +434,65 @@ class TestGetUploadFormData:
         mock_json_dump.assert_called_once_with(other_roster, mock_file(), indent=2)
 
 
+class TestUploadContext:
+    def test_fetch_once_and_lookup_many(self):
+        mock_session = MagicMock()
+        mock_response = MagicMock()
+
+        roster_json = json.dumps([{"id": 1, "name": "Alice Smith"}, {"id": 2, "name": "Bob Jones"}])
+        mock_response.text = f"""
+        <html>
+            <head><meta name="csrf-token" content="csrf_meta_token"></head>
+            <body>
+                Log Out
+                <script>gon.roster = {roster_json};</script>
+            </body>
+        </html>
+        """
+        mock_session.get.return_value = mock_response
+
+        token, student_data = fetch_upload_context(mock_session, "https://gradescope.com/fake")
+        assert token == "csrf_meta_token"
+        assert lookup_student_id(student_data, "alice smith") == 1
+        assert lookup_student_id(student_data, "Bob Jones") == 2
+        assert lookup_student_id(student_data, "Carol White") is None
+        mock_session.get.assert_called_once()
+
+    def test_token_attribute_order_and_escaping(self):
+        mock_session = MagicMock()
+        mock_response = MagicMock()
+        mock_response.text = """
+        <html>
+            <head><meta content="abc+def&amp;ghi==" name='csrf-token' /></head>
+            <body>Log Out</body>
+        </html>
+        """
+        mock_session.get.return_value = mock_response
+
+        token, student_data = fetch_upload_context(mock_session, "https://gradescope.com/fake")
+        assert token == "abc+def&ghi=="
+        assert student_data is None
+
+    def test_lookup_uses_index_for_filename_names(self):
+        student_data = [
+            {"id": 1, "name": "Joann Lee"},
+            {"id": 2, "name": "Ann Lee"},
+            {"id": 3, "name": "Alice Smith (Student)"},
+        ]
+        name_index = build_roster_index(student_data)
+
+        assert name_index["ann lee"] == 2
+        # exact names win over an earlier partial match
+        assert lookup_student_id(student_data, "ann_lee", name_index) == 2
+        assert lookup_student_id(student_data, "ANN  LEE", name_index) == 2
+        # partial names still fall back to the roster scan
+        assert lookup_student_id(student_data, "alice smith", name_index) == 3
+
+    def test_lookup_without_roster(self):
+        assert lookup_student_id(None, "Alice Smith") is None
+        assert lookup_student_id([{"id": 1, "name": "Alice Smith"}], "") is None
+
+
 class TestPrepareFileUploads:
     def test_prepare_file_structure(self):
         # Create a temporary directory and a sample file
@@ -473,7 +574,7 @@ class TestPrepareFileUploads:
             shutil.rmtree(temp_dir)
 
     @patch('time.sleep')
-    def test_prepare_files_with_delay(self, mock_sleep):
+    def test_prepare_files_without_delay(self, mock_sleep):
         temp_dir = tempfile.mkdtemp()
         
         try:
@@ -484,8 +585,8 @@ class TestPrepareFileUploads:
             extracted_files = [(file_path, "test.txt")]
             files, file_objs = prepare_file_uploads(extracted_files)
 
-            # Verify sleep was called for delay simulation
-            mock_sleep.assert_called_with(0.1)
+            # No simulated user delay between files
+            mock_sleep.assert_not_called()
 
         finally:
             for f in file_objs:
@@ -542,6 +643,24 @@ class TestUploadFiles:
         assert kwargs['data']['authenticity_token'] == csrf_token
         assert 'submission[owner_id]' not in kwargs['data']
 
+    @patch('time.sleep')
+    def test_upload_files_retries_after_rate_limit(self, mock_sleep):
+        mock_session = MagicMock()
+        limited = MagicMock(status_code=429, headers={'Retry-After': '3'})
+        accepted = MagicMock(status_code=200, headers={})
+        mock_session.post.side_effect = [limited, accepted]
+
+        file_obj = BytesIO(b"Hello!")
+        file_obj.read()  # consumed by the first attempt
+        files = [('submission[files][]', ('test.txt', file_obj, 'application/octet-stream'))]
+
+        response = upload_files(mock_session, "https://gradescope.com/fake/upload", "csrf123", "42", files)
+
+        assert response is accepted
+        assert mock_session.post.call_count == 2
+        mock_sleep.assert_called_once_with(3.0)
+        assert file_obj.read() == b"Hello!"
+
     def test_upload_files_with_redirect(self):
         mock_session = MagicMock()
         mock_response = MagicMock()
@@ -733,6 +852,59 @@ class TestVerifyUpload:
 
         assert result is False
 
+    def test_verify_upload_success_writes_no_debug_files(self, test_setup):
+        debug_dir, course_id, assignment_id, student_name = test_setup
+
+        upload_resp = MagicMock(status_code=200, text="Your submission was received", headers={})
+        mock_session = MagicMock()
+        mock_session.get.return_value = MagicMock(text=f"{student_name} submitted")
+
+        assert verify_upload(mock_session, course_id, assignment_id, upload_resp, student_name, debug_dir) is True
+        assert os.listdir(debug_dir) == []
+
+        # debug mode keeps the pages of successful uploads as well
+        assert verify_upload(mock_session, course_id, assignment_id, upload_resp, student_name, debug_dir, debug=True) is True
+        assert sorted(f.split("_")[0] for f in os.listdir(debug_dir)) == ["submissions", "upload"]
+
+    @patch('time.time', return_value=1234567890)
+    def test_verify_upload_same_second_failures_keep_both_pages(self, mock_time, test_setup):
+        debug_dir, course_id, assignment_id, student_name = test_setup
+
+        upload_resp = MagicMock(status_code=500, text="Server error", headers={})
+        mock_session = MagicMock()
+
+        # two uploads failing within the same second must not overwrite each other's pages
+        verify_upload(mock_session, course_id, assignment_id, upload_resp, student_name, debug_dir)
+        verify_upload(mock_session, course_id, assignment_id, upload_resp, student_name, debug_dir)
+        assert len(os.listdir(debug_dir)) == 4
+
+    def test_verify_upload_leaves_list_check_to_batch(self, test_setup):
+        debug_dir, course_id, assignment_id, student_name = test_setup
+
+        upload_resp = MagicMock(status_code=200, text="<html>Assignment</html>", headers={})
+        mock_session = MagicMock()
+
+        result = verify_upload(mock_session, course_id, assignment_id, upload_resp, student_name, debug_dir,
+                               check_submissions=False)
+
+        assert result is None
+        mock_session.get.assert_not_called()
+        assert os.listdir(debug_dir) == []
+
+    def test_confirm_pending_uploads_fetches_list_once(self, test_setup):
+        debug_dir, course_id, assignment_id, _ = test_setup
+
+        mock_session = MagicMock()
+        mock_session.get.return_value = MagicMock(text="<td>Alice O&#39;Neil</td><td>Bob Jones</td>")
+
+        found = confirm_pending_uploads(mock_session, course_id, assignment_id,
+                                        ["alice o'neil", "Bob Jones", "Carol White"], debug_dir)
+
+        assert found == [True, True, False]
+        mock_session.get.assert_called_once()
+        # the list is kept for debugging because a student is missing
+        assert [f.split("_")[0] for f in os.listdir(debug_dir)] == ["submissions"]
+
     @patch('os.makedirs')
     @patch('builtins.open', new_callable=mock_open)
     @patch('time.time', return_value=1234567890)
@@ -756,8 +928,8 @@ class TestVerifyUpload:
         )
 
         assert result is False
-        # Verify debug directory creation and file writing
-        mock_makedirs.assert_called_with(debug_dir, exist_ok=True)
+        # The debug directory is created by the caller, only the files are written
+        mock_makedirs.assert_not_called()
         assert mock_file.call_count >= 1  # At least error response file
 
 
@@ -880,7 +1052,7 @@ class TestUploadMultipleAssignments:
 
     @patch("upload_defs.upload_single_assignment")
     @patch("time.sleep")
-    def test_upload_multiple_with_delays(self, mock_sleep, mock_single_upload):
+    def test_upload_multiple_without_delays(self, mock_sleep, mock_single_upload):
         session = MagicMock()
         course_id = "COURSE123"
         assignment_id = "ASSIGN456"
@@ -895,8 +1067,9 @@ class TestUploadMultipleAssignments:
             with patch('gui_win.gui_show_selection') as mock_gui:
                 results = upload_mutliple_assignments(session, course_id, assignment_id, files)
 
-            # Verify sleep was called for delays
-            assert mock_sleep.call_count >= 2  # At least one sleep per file
+            # Files are uploaded concurrently, no fixed delay between them
+            mock_sleep.assert_not_called()
+            assert [name for name, _, _ in results] == [os.path.basename(f) for f in files]
             
             # Verify GUI was called with results
             mock_gui.assert_called_once()
@@ -988,6 +1161,30 @@ class TestUploadMultipleAssignments:
                 if os.path.exists(f):
                     os.remove(f)
 
+    @patch("upload_defs.gui.gui_show_selection")
+    @patch("upload_defs.upload_single_assignment")
+    def test_upload_multiple_confirms_pending_once(self, mock_single_upload, mock_gui):
+        session = MagicMock()
+        session.get.return_value = MagicMock(text="Log Out")  # no csrf token, uploads fetch it themselves
+
+        temp_dir = tempfile.mkdtemp()
+        files = [os.path.join(temp_dir, f"{name}.zip") for name in ("Alice_Smith", "Bob_Jones", "Carol_White")]
+        for f in files:
+            open(f, "wb").close()
+
+        try:
+            # Alice confirmed by the upload response, Bob and Carol still pending
+            mock_single_upload.side_effect = lambda *args, **kwargs: True if "Alice" in args[3] else None
+
+            with patch("upload_defs.confirm_pending_uploads", return_value=[True, False]) as mock_confirm:
+                results = upload_mutliple_assignments(session, "COURSE123", "ASSIGN456", files, debug_dir=temp_dir)
+
+            mock_confirm.assert_called_once()
+            assert mock_confirm.call_args[0][3] == ["Bob_Jones", "Carol_White"]
+            assert [success for _, success, _ in results] == [True, True, False]
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
     @patch("upload_defs.upload_single_assignment")
     @patch('platform.system', return_value='Darwin')  # Test macOS branch
     def test_upload_multiple_macos_gui(self, mock_platform, mock_single_upload):